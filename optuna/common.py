@@ -1,15 +1,28 @@
 """Common utilities shared between optimizers."""
 
+import fcntl
 import json
+import os
+import shutil
+import stat
 import subprocess
+import tempfile
+import threading
 import time
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from dataclasses import replace
+from functools import cache
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar, Generic, Protocol, TypeVar
 
+import optuna
+from optuna.distributions import CategoricalDistribution
+from optuna.storages import JournalStorage
+from optuna.storages.journal import JournalFileBackend
 from python_terraform import Terraform
 
 # Re-export pricing for backward compatibility
-from pricing import CloudPricing, get_cloud_pricing  # noqa: F401
+from pricing import CloudPricing, filter_valid_ram, get_cloud_pricing  # noqa: F401
 
 
 # ============================================================================
@@ -17,43 +30,236 @@ from pricing import CloudPricing, get_cloud_pricing  # noqa: F401
 # ============================================================================
 
 
+# Multiplexed SSH: after the first successful command to a VM, a background
+# master connection is kept open and later commands reuse it instead of doing
+# a fresh TCP + SSH handshake each time.
+# Sockets live in a per-user directory (the runtime dir, else ~/.ssh) so no
+# other local user can pre-create it and capture or impersonate a master.
+SSH_CONTROL_DIR = (
+    Path(os.environ.get("XDG_RUNTIME_DIR") or Path.home() / ".ssh") / "optuna-ssh"
+)
+SSH_CONTROL_PERSIST_S = 600
+
+# Control path -> time.monotonic() a master was last confirmed (or started)
+# for it. Within SSH_CONTROL_PERSIST_S of that, successful commands skip the
+# `ssh -O check`; a failed command forgets the entry.
+_SSH_MASTER_CHECKED: dict[Path, float] = {}
+
+
+@cache
+def _ssh_control_dir() -> Path | None:
+    """SSH_CONTROL_DIR if it is private to this user, else None (no multiplexing)."""
+    try:
+        SSH_CONTROL_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = SSH_CONTROL_DIR.lstat()
+    except OSError as e:
+        print(f"  Warning: SSH multiplexing disabled: {e}")
+        return None
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        print(
+            f"  Warning: SSH multiplexing disabled: {SSH_CONTROL_DIR} must be a "
+            "directory owned by this user with mode 0700"
+        )
+        return None
+    return SSH_CONTROL_DIR
+
+
+def _start_ssh_master(ssh_args: list[str], vm_ip: str) -> None:
+    """Start a persistent SSH master connection for vm_ip (best effort)."""
+    master_args = [
+        *ssh_args,
+        "-o",
+        "ControlMaster=yes",
+        "-o",
+        f"ControlPersist={SSH_CONTROL_PERSIST_S}s",
+        # Let the master exit soon after the VM goes away (e.g. destroyed)
+        "-o",
+        "ServerAliveInterval=15",
+        "-o",
+        "ServerAliveCountMax=3",
+        "-N",
+        "-f",
+        f"root@{vm_ip}",
+    ]
+    try:
+        # No pipes: the backgrounded master must not hold our stdout open
+        subprocess.run(
+            master_args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=30,
+            check=False,
+        )
+    except subprocess.TimeoutExpired:
+        pass
+
+
+def _ssh_master_alive(ssh_args: list[str], vm_ip: str, control_path: Path) -> bool:
+    """Whether a master is serving control_path; removes a dead one's socket.
+
+    A master that died (VM rebooted, ControlPersist expired, process killed)
+    leaves its socket behind, so existence alone doesn't mean it's usable.
+    """
+    if not control_path.exists():
+        return False
+    try:
+        result = subprocess.run(
+            [*ssh_args, "-O", "check", f"root@{vm_ip}"],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            timeout=10,
+            check=False,
+        )
+        if result.returncode == 0:
+            return True
+    except subprocess.TimeoutExpired:
+        pass
+    control_path.unlink(missing_ok=True)
+    return False
+
+
+def _ensure_ssh_master(ssh_args: list[str], vm_ip: str, control_path: Path) -> None:
+    """Start a master for control_path unless one was confirmed recently."""
+    checked = _SSH_MASTER_CHECKED.get(control_path)
+    if checked is not None and time.monotonic() - checked < SSH_CONTROL_PERSIST_S:
+        return
+    if not _ssh_master_alive(ssh_args, vm_ip, control_path):
+        _start_ssh_master(ssh_args, vm_ip)
+    _SSH_MASTER_CHECKED[control_path] = time.monotonic()
+
+
+def _ssh_options(vm_ip: str, jump_host: str | None) -> tuple[list[str], Path | None]:
+    """SSH -o options shared by ssh and scp, and the control socket path.
+
+    The path is None when multiplexing is disabled (see _ssh_control_dir).
+    """
+    options = [
+        "-o",
+        "StrictHostKeyChecking=no",
+        "-o",
+        "UserKnownHostsFile=/dev/null",
+        "-o",
+        "ConnectTimeout=10",
+        "-o",
+        "LogLevel=ERROR",
+    ]
+    control_dir = _ssh_control_dir()
+    control_path = None
+    if control_dir is not None:
+        # Internal IPs repeat across environments, so key the socket on the jump host too
+        control_name = f"root@{vm_ip}" + (f"-via-{jump_host}" if jump_host else "")
+        control_path = control_dir / control_name
+        options.extend(["-o", f"ControlPath={control_path}"])
+    if jump_host:
+        # Use ProxyCommand instead of -J to pass SSH options to jump host too
+        proxy_cmd = f"ssh -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null -o LogLevel=ERROR -W %h:%p root@{jump_host}"
+        options.extend(["-o", f"ProxyCommand={proxy_cmd}"])
+    return options, control_path
+
+
 def run_ssh_command(
     vm_ip: str,
     command: str,
     timeout: int = 300,
     forward_agent: bool = False,
     jump_host: str | None = None,
+    line_callback: Callable[[str], None] | None = None,
 ) -> tuple[int, str]:
     """Run command on remote VM via SSH.
 
+    Reuses a multiplexed master connection to the VM when one is open, and
+    opens one after the first successful command.
+
     Args:
         vm_ip: IP address of VM to connect to
         command: Command to run on VM
         timeout: Command timeout in seconds
         forward_agent: If True, forward SSH agent for nested SSH connections
         jump_host: If set, use this host as SSH jump/proxy host (for internal IPs)
+        line_callback: If set, called with each output line as it arrives
+            (stdout and stderr merged). If it raises, the connection is
+            closed and the exception propagates.
     """
-    ssh_args = [
-        "ssh",
-        "-o",
-        "StrictHostKeyChecking=no",
-        "-o",
-        "UserKnownHostsFile=/dev/null",
-        "-o",
-        "ConnectTimeout=10",
-        "-o",
-        "LogLevel=ERROR",
-    ]
+    options, control_path = _ssh_options(vm_ip, jump_host)
+    ssh_args = ["ssh", *options]
     if forward_agent:
         ssh_args.append("-A")
-    if jump_host:
-        # Use ProxyCommand instead of -J to pass SSH options to jump host too
-        proxy_cmd = f"ssh -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null -o LogLevel=ERROR -W %h:%p root@{jump_host}"
-        ssh_args.extend(["-o", f"ProxyCommand={proxy_cmd}"])
-    ssh_args.extend([f"root@{vm_ip}", command])
 
+    # ControlMaster=no: use the master if its socket is live, else connect directly
+    cmd = [*ssh_args, "-o", "ControlMaster=no", f"root@{vm_ip}", command]
+    if line_callback:
+        returncode, output = _run_streaming(cmd, timeout, line_callback)
+    else:
+        result = subprocess.run(
+            cmd, capture_output=True, text=True, timeout=timeout, check=False
+        )
+        returncode, output = result.returncode, result.stdout + result.stderr
+    if control_path is not None:
+        if returncode == 0:
+            _ensure_ssh_master(ssh_args, vm_ip, control_path)
+        else:
+            _SSH_MASTER_CHECKED.pop(control_path, None)
+    return returncode, output
+
+
+def _run_streaming(
+    cmd: list[str], timeout: int, line_callback: Callable[[str], None]
+) -> tuple[int, str]:
+    """Run cmd, passing each output line to line_callback as it arrives."""
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    )
+    # Reading blocks, so enforce the timeout by killing the process
+    watchdog = threading.Timer(timeout, proc.kill)
+    watchdog.start()
+    lines = []
+    try:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            lines.append(line)
+            line_callback(line.rstrip("\n"))
+        returncode = proc.wait()
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        timed_out = not watchdog.is_alive()
+        watchdog.cancel()
+    output = "".join(lines)
+    if timed_out:
+        raise subprocess.TimeoutExpired(cmd, timeout, output=output)
+    return returncode, output
+
+
+def copy_to_vm(
+    vm_ip: str,
+    local_paths: list[Path],
+    remote_dir: str,
+    timeout: int = 120,
+    jump_host: str | None = None,
+) -> tuple[int, str]:
+    """Copy files into an existing directory on a VM via scp (keeps file modes).
+
+    Uses the same multiplexed connection as run_ssh_command().
+    """
+    options, _ = _ssh_options(vm_ip, jump_host)
     result = subprocess.run(
-        ssh_args,
+        [
+            "scp",
+            "-pq",
+            *options,
+            "-o",
+            "ControlMaster=no",
+            *[str(p) for p in local_paths],
+            f"root@{vm_ip}:{remote_dir}/",
+        ],
         capture_output=True,
         text=True,
         timeout=timeout,
@@ -66,21 +272,26 @@ def wait_for_vm_ready(
     timeout: int = 600,
     jump_host: str | None = None,
 ) -> bool:
-    """Wait for VM to be ready (cloud-init complete)."""
+    """Wait for VM to be ready (cloud-init complete).
+
+    Polls with exponential backoff (2s up to 15s): a fast-booting VM is
+    noticed quickly and a slow one isn't probed needlessly often.
+    """
     print(f"  Waiting for VM {vm_ip} to be ready...")
 
-    start = time.time()
-    while time.time() - start < timeout:
+    start = time.monotonic()
+    delay = 2.0
+    while time.monotonic() - start < timeout:
         try:
             code, output = run_ssh_command(
                 vm_ip, "test -f /root/cloud-init-ready", timeout=15, jump_host=jump_host
             )
             if code == 0:
-                elapsed = int(time.time() - start)
+                elapsed = int(time.monotonic() - start)
                 print(f"  VM is ready! ({elapsed}s)")
                 return True
 
-            elapsed = int(time.time() - start)
+            elapsed = int(time.monotonic() - start)
             # Check if SSH itself failed (connection refused, etc.)
             if "Connection refused" in output or "No route to host" in output:
                 print(f"  SSH not ready yet ({elapsed}s elapsed)")
@@ -99,9 +310,10 @@ def wait_for_vm_ready(
                     f"  Marker file not ready yet ({elapsed}s elapsed): {log_preview}"
                 )
         except Exception as e:
-            elapsed = int(time.time() - start)
+            elapsed = int(time.monotonic() - start)
             print(f"  SSH not ready yet ({elapsed}s elapsed): {e}")
-        time.sleep(10)
+        time.sleep(delay)
+        delay = min(delay * 1.5, 15.0)
 
     print(f"  Warning: VM not ready after {timeout}s, continuing anyway...")
     return False
@@ -128,22 +340,262 @@ def validate_vm_exists(vm_ip: str) -> bool:
         return False
 
 
+def write_text_atomic(path: Path, text: str) -> None:
+    """Write a file via a temp file + rename, so readers never see a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
 def load_results(results_path: Path) -> list[dict[str, Any]]:
     """Load results from a JSON file."""
     if results_path.exists():
         with open(results_path) as f:
+            # Shared lock: wait out an in-progress append_result()
+            fcntl.flock(f, fcntl.LOCK_SH)
             return json.load(f)
     return []
 
 
 def save_results(results: list[dict[str, Any]], results_path: Path) -> None:
-    """Save results to a JSON file."""
-    with open(results_path, "w") as f:
-        json.dump(results, f, indent=2)
+    """Save results to a JSON file (atomically replaced)."""
+    write_text_atomic(results_path, json.dumps(results, indent=2))
+
+
+def append_result(result: dict[str, Any], results_path: Path) -> None:
+    """Append one result to a JSON results file without rewriting it.
+
+    Only the closing bracket is rewritten, and the output is byte-for-byte what
+    save_results() would write for the extended list. An exclusive lock keeps
+    concurrent appends (e.g. parallel trials or processes) from interleaving.
+    """
+    item = json.dumps(result, indent=2).replace("\n", "\n  ")
+    fd = os.open(results_path, os.O_RDWR | os.O_CREAT, 0o644)
+    with os.fdopen(fd, "rb+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            f.write(f"[\n  {item}\n]".encode())
+        else:
+            tail_start = f.seek(max(0, size - 64))
+            tail = f.read()
+            body = tail[: tail.rindex(b"]")].rstrip()
+            sep = "\n  " if body.endswith(b"[") else ",\n  "
+            f.seek(tail_start + len(body))
+            f.write(f"{sep}{item}\n]".encode())
+            f.truncate()
+        f.flush()
+        os.fsync(f.fileno())
+
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+
+
+class ResultIndex(Generic[KeyT]):
+    """Successful results from a JSON results file, indexed by config key.
+
+    The index is rebuilt only when the file changes on disk, and append()
+    indexes its own write without re-reading the file. A lock serializes
+    file and index updates between parallel trials.
+    """
+
+    def __init__(
+        self,
+        results_path: Path,
+        key_fn: Callable[[dict[str, Any]], KeyT],
+        is_success: Callable[[dict[str, Any]], bool],
+    ):
+        self.results_path = results_path
+        self._key_fn = key_fn
+        self._is_success = is_success
+        self._index: dict[KeyT, dict[str, Any]] = {}
+        self._mtime: int | None = None
+        self._lock = threading.Lock()
+
+    def _mtime_on_disk(self) -> int | None:
+        try:
+            return self.results_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _add(self, result: dict[str, Any]) -> None:
+        if self._is_success(result):
+            self._index.setdefault(self._key_fn(result), result)  # First one wins
+
+    def _refresh(self) -> None:
+        """Re-index the results file if it changed. Call with the lock held."""
+        mtime = self._mtime_on_disk()
+        if mtime != self._mtime:
+            self._index.clear()
+            for result in load_results(self.results_path):
+                self._add(result)
+            self._mtime = mtime
+
+    def get(self, key: KeyT) -> dict[str, Any] | None:
+        """Successful result for a config key, if any."""
+        with self._lock:
+            self._refresh()
+            return self._index.get(key)
+
+    def results(self) -> list[dict[str, Any]]:
+        """All indexed successful results."""
+        with self._lock:
+            self._refresh()
+            return list(self._index.values())
+
+    def append(self, result: dict[str, Any]) -> None:
+        """Append a result to the file and index it."""
+        with self._lock:
+            fresh = self._mtime is not None and self._mtime == self._mtime_on_disk()
+            append_result(result, self.results_path)
+            if fresh:
+                self._add(result)
+                self._mtime = self._mtime_on_disk()
+
+
+def open_study_storage(
+    journal_path: Path, legacy_db: Path | None = None
+) -> JournalStorage:
+    """Optuna storage backed by an append-only journal file.
+
+    Trials are appended to the file instead of going through SQLite's
+    single-writer lock, so parallel trials and processes don't contend on it.
+    If legacy_db (an SQLite study.db) exists and the journal does not yet,
+    its studies are copied into the journal once.
+    """
+    if legacy_db is not None and legacy_db.exists():
+        _migrate_legacy_study(legacy_db, journal_path)
+    return JournalStorage(JournalFileBackend(str(journal_path)))
+
+
+def _migrate_legacy_study(legacy_db: Path, journal_path: Path) -> None:
+    """Copy legacy_db's studies into journal_path unless it already exists.
+
+    Processes opening the same study (e.g. one per cloud) serialize on a
+    sidecar lock file. Studies are copied into a temporary journal that only
+    replaces journal_path once complete, so a failed migration is retried on
+    the next run instead of leaving a partial journal behind.
+    """
+    lock_path = journal_path.with_name(f"{journal_path.name}.migrate.lock")
+    with open(lock_path, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if journal_path.exists():
+            return
+        tmp_path = journal_path.with_name(f"{journal_path.name}.migrating")
+        tmp_path.unlink(missing_ok=True)  # left by an interrupted attempt
+        tmp_storage = JournalStorage(JournalFileBackend(str(tmp_path)))
+        legacy_url = f"sqlite:///{legacy_db}"
+        summaries = optuna.get_all_study_summaries(legacy_url, include_best_trial=False)
+        for summary in summaries:
+            optuna.copy_study(
+                from_study_name=summary.study_name,
+                from_storage=legacy_url,
+                to_storage=tmp_storage,
+            )
+        if tmp_path.exists():
+            os.replace(tmp_path, journal_path)
+        print(f"  Migrated {len(summaries)} studies from {legacy_db} to {journal_path}")
+
+
+def cached_metric_value(
+    result: dict[str, Any],
+    metric: str,
+    throughput_key: str,
+    cost_fn: Callable[[dict[str, Any]], float],
+    metric_fn: Callable[[dict[str, Any], str], float],
+) -> float:
+    """Objective value of a stored result (cost is not stored, so derive it).
+
+    cost_efficiency is result[throughput_key] per cost_fn(result["config"]);
+    any other metric is metric_fn(result, metric).
+    """
+    if metric == "cost_efficiency":
+        cost = cost_fn(result["config"])
+        return result[throughput_key] / cost if cost > 0 else 0
+    return metric_fn(result, metric)
+
+
+@cache
+def search_distributions(
+    cloud: str,
+    get_config_space: Callable[[str], dict[str, Any]],
+    param_names: tuple[str, ...],
+) -> dict[str, CategoricalDistribution]:
+    """Distributions of every trial parameter, built once per cloud (read-only).
+
+    param_names are taken from the config space as-is. RAM choices depend on
+    the CPU, so each CPU count has its own ram_per_node_cpu{N} parameter
+    (see OPTIMIZER_GUIDE.md).
+    """
+    space = get_config_space(cloud)
+    distributions = {name: CategoricalDistribution(space[name]) for name in param_names}
+    for cpu in space["cpu_per_node"]:
+        distributions[f"ram_per_node_cpu{cpu}"] = CategoricalDistribution(
+            filter_valid_ram(cloud, cpu, space["ram_per_node"])
+        )
+    return distributions
+
+
+def trial_params(config: dict[str, Any], param_names: Sequence[str]) -> dict[str, Any]:
+    """Trial parameters of a config, named as in search_distributions()."""
+    params = {name: config[name] for name in param_names}
+    params[f"ram_per_node_cpu{config['cpu_per_node']}"] = config["ram_per_node"]
+    return params
+
+
+def seed_study_from_results(
+    study: optuna.Study,
+    results: Iterable[dict[str, Any]],
+    distributions: dict[str, CategoricalDistribution],
+    param_names: Sequence[str],
+    value_fn: Callable[[dict[str, Any]], float],
+) -> int:
+    """Add past results to the study as completed trials.
+
+    TPE then models them from the first trial instead of spending trials (and
+    its random startup budget) rediscovering them. Configs already in the study
+    or outside distributions are skipped. Returns the number added.
+    """
+    existing = {frozenset(t.params.items()) for t in study.get_trials(deepcopy=False)}
+    trials = []
+    for result in results:
+        params = trial_params(result["config"], param_names)
+        if any(
+            name not in distributions or value not in distributions[name].choices
+            for name, value in params.items()
+        ):
+            continue
+        if frozenset(params.items()) in existing:
+            continue
+        trials.append(
+            optuna.trial.create_trial(
+                params=params,
+                distributions={name: distributions[name] for name in params},
+                value=value_fn(result),
+            )
+        )
+    study.add_trials(trials)
+    return len(trials)
+
+
+# One Terraform handle per working directory, so `terraform init` only runs the
+# first time a directory is used (or after its `.terraform` disappears)
+_TERRAFORM_INSTANCES: dict[Path, Terraform] = {}
 
 
 def get_terraform(terraform_dir: Path) -> Terraform:
     """Get Terraform instance, initializing if needed."""
+    tf = _TERRAFORM_INSTANCES.get(terraform_dir)
+    if tf is not None and (terraform_dir / ".terraform").exists():
+        return tf
+
     tf_dir = str(terraform_dir)
     tf = Terraform(working_dir=tf_dir)
 
@@ -155,6 +607,7 @@ def get_terraform(terraform_dir: Path) -> Terraform:
         if ret_code != 0:
             raise RuntimeError(f"Terraform init failed: {stderr}")
 
+    _TERRAFORM_INSTANCES[terraform_dir] = tf
     return tf
 
 
@@ -174,6 +627,19 @@ def get_tf_output(tf: Terraform, name: str) -> str | None:
         return None
 
 
+def get_tf_outputs(tf: Terraform, *names: str) -> tuple[str | None, ...]:
+    """Get several terraform output values with one `terraform output -json`.
+
+    Each missing or null output is None, like get_tf_output().
+    """
+    try:
+        outputs = tf.output() or {}
+    except ValueError:  # no state yet: empty or non-JSON output
+        outputs = {}
+    values = (outputs.get(name, {}).get("value") for name in names)
+    return tuple(str(value) if value else None for value in values)
+
+
 def is_stale_state_error(stderr: str | None) -> bool:
     """Check if the error indicates stale terraform state."""
     if stderr is None:
@@ -183,8 +649,7 @@ def is_stale_state_error(stderr: str | None) -> bool:
 
 def clear_terraform_state(terraform_dir: Path) -> None:
     """Clear Terraform state files to start fresh."""
-    import os
-
+    _TERRAFORM_INSTANCES.pop(terraform_dir, None)
     for f in ["terraform.tfstate", "terraform.tfstate.backup"]:
         path = terraform_dir / f
         if path.exists():
@@ -192,12 +657,24 @@ def clear_terraform_state(terraform_dir: Path) -> None:
             print(f"  Removed stale state: {path}")
 
 
-def destroy_all(terraform_dir: Path, cloud_name: str) -> bool:
-    """Destroy all infrastructure."""
+def destroy_all(
+    terraform_dir: Path,
+    cloud_name: str,
+    tf_vars: dict[str, bool | int | str] | None = None,
+) -> bool:
+    """Destroy all infrastructure.
+
+    tf_vars should repeat the variables the resources were applied with
+    (e.g. a worker's environment_name).
+    """
     print(f"\nDestroying all resources on {cloud_name}...")
 
+    var_args = [
+        f"-var={name}={str(value).lower() if isinstance(value, bool) else value}"
+        for name, value in (tf_vars or {}).items()
+    ]
     result = subprocess.run(
-        ["terraform", "destroy", "-auto-approve"],
+        ["terraform", "destroy", "-auto-approve", *var_args],
         cwd=str(terraform_dir),
         capture_output=True,
         text=True,
@@ -209,3 +686,96 @@ def destroy_all(terraform_dir: Path, cloud_name: str) -> bool:
 
     print("  All resources destroyed.")
     return True
+
+
+def make_worker_dir(terraform_dir: Path, worker_id: int) -> Path:
+    """Terraform directory for a parallel worker: terraform/<cloud>-w<N>.
+
+    Configuration is copied; state and plans are not. The secret
+    terraform.tfvars and the initialized .terraform are symlinked to the
+    originals, so credentials aren't duplicated and providers are installed
+    only once. The directory outlives the run only while it holds resources
+    (see remove_worker_dir).
+    """
+    get_terraform(terraform_dir)  # workers share its .terraform
+    worker_dir = terraform_dir.with_name(f"{terraform_dir.name}-w{worker_id}")
+    shutil.copytree(
+        terraform_dir,
+        worker_dir,
+        symlinks=True,
+        dirs_exist_ok=True,
+        ignore=shutil.ignore_patterns(
+            "terraform.tfstate*", "*.tfplan", "terraform.tfvars", ".terraform"
+        ),
+    )
+    for name in ("terraform.tfvars", ".terraform"):
+        link = worker_dir / name
+        # Replace copies left by older versions as well as stale links
+        if link.is_symlink() or link.is_file():
+            link.unlink()
+        elif link.is_dir():
+            shutil.rmtree(link)
+        source = terraform_dir.resolve() / name
+        if source.exists():
+            link.symlink_to(source)
+    return worker_dir
+
+
+def remove_worker_dir(worker_dir: Path) -> None:
+    """Remove a worker directory made by make_worker_dir (after destroy)."""
+    _TERRAFORM_INSTANCES.pop(worker_dir, None)
+    if worker_dir.exists():
+        shutil.rmtree(worker_dir)
+        print(f"  Removed worker directory: {worker_dir}")
+
+
+class WorkspaceConfig(Protocol):
+    """A dataclass cloud config that owns one Terraform working directory."""
+
+    __dataclass_fields__: ClassVar[dict[str, Any]]
+    name: str
+    terraform_dir: Path
+    environment_name: str | None
+
+
+WorkspaceT = TypeVar("WorkspaceT", bound=WorkspaceConfig)
+
+
+def make_worker_configs(cloud_config: WorkspaceT, workers: int) -> list[WorkspaceT]:
+    """Configs for parallel trials, each with its own Terraform dir.
+
+    Worker 0 uses the regular directory. Others get terraform/<cloud>-w<N>
+    (see make_worker_dir) and a distinct environment_name so their cloud
+    resources don't collide.
+    """
+    configs = [cloud_config]
+    for worker_id in range(1, workers):
+        worker_dir = make_worker_dir(cloud_config.terraform_dir, worker_id)
+        configs.append(
+            replace(
+                cloud_config,
+                terraform_dir=worker_dir,
+                environment_name=f"optuna-w{worker_id}",
+            )
+        )
+    return configs
+
+
+def terraform_vars(
+    cloud_config: WorkspaceConfig, **tf_vars: bool | int | str
+) -> dict[str, bool | int | str]:
+    """Terraform variables for cloud_config's workspace."""
+    if cloud_config.environment_name:
+        tf_vars["environment_name"] = cloud_config.environment_name
+    return tf_vars
+
+
+def destroy_workspace(cloud_config: WorkspaceConfig) -> None:
+    """Destroy a workspace's resources; a worker's directory goes with them."""
+    if not cloud_config.terraform_dir.exists():
+        return
+    destroyed = destroy_all(
+        cloud_config.terraform_dir, cloud_config.name, terraform_vars(cloud_config)
+    )
+    if destroyed and cloud_config.environment_name:
+        remove_worker_dir(cloud_config.terraform_dir)
@@ -98,45 +98,60 @@ function randomChoice(arr) {
   return arr[Math.floor(Math.random() * arr.length)];
 }
 
-function buildSearchRequest(queryType) {
-  let query, filter, sort;
+// Every possible request body, serialized once at init instead of building and
+// JSON.stringify-ing a body per iteration. Picking uniformly within a group
+// gives the same distribution as picking each part separately.
+function serializeAll(queries, extras) {
+  const bodies = [];
+  for (const q of queries) {
+    for (const extra of extras) {
+      bodies.push(JSON.stringify({ q, limit: 20, ...extra }));
+    }
+  }
+  return bodies;
+}
 
+const SIMPLE_BODIES = serializeAll(SIMPLE_QUERIES, [{}]);
+const TYPO_BODIES = serializeAll(TYPO_QUERIES, [{}]);
+const CATEGORY_FILTER_BODIES = serializeAll(
+  SIMPLE_QUERIES,
+  CATEGORY_FILTERS.map((filter) => ({ filter }))
+);
+const PRICE_FILTER_BODIES = serializeAll(
+  SIMPLE_QUERIES,
+  PRICE_FILTERS.map((filter) => ({ filter }))
+);
+const COMBINED_FILTER_BODIES = serializeAll(
+  SIMPLE_QUERIES,
+  COMBINED_FILTERS.map((filter) => ({ filter }))
+);
+const PHRASE_SORT_BODIES = serializeAll(PHRASE_QUERIES, [
+  { sort: ["price:asc"] },
+  { sort: ["rating:desc"] },
+]);
+
+function buildSearchRequest(queryType) {
   switch (queryType) {
     case "simple":
       // 50% - Simple keyword search
-      query = randomChoice(SIMPLE_QUERIES);
-      break;
+      return randomChoice(SIMPLE_BODIES);
 
     case "typo":
       // 20% - Typo-tolerant search
-      query = randomChoice(TYPO_QUERIES);
-      break;
+      return randomChoice(TYPO_BODIES);
 
-    case "filtered":
+    case "filtered": {
       // 20% - Filtered search
-      query = randomChoice(SIMPLE_QUERIES);
       const filterType = Math.random();
-      if (filterType < 0.3) {
-        filter = randomChoice(CATEGORY_FILTERS);
-      } else if (filterType < 0.6) {
-        filter = randomChoice(PRICE_FILTERS);
-      } else {
-        filter = randomChoice(COMBINED_FILTERS);
-      }
-      break;
+      if (filterType < 0.3) return randomChoice(CATEGORY_FILTER_BODIES);
+      if (filterType < 0.6) return randomChoice(PRICE_FILTER_BODIES);
+      return randomChoice(COMBINED_FILTER_BODIES);
+    }
 
     case "phrase_sort":
       // 10% - Phrase + sort
-      query = randomChoice(PHRASE_QUERIES);
-      sort = Math.random() > 0.5 ? ["price:asc"] : ["rating:desc"];
-      break;
+      return randomChoice(PHRASE_SORT_BODIES);
   }
-
-  const body = { q: query, limit: 20 };
-  if (filter) body.filter = filter;
-  if (sort) body.sort = sort;
-
-  return body;
 }
 
 function selectQueryType() {
@@ -147,32 +162,32 @@ function selectQueryType() {
   return "phrase_sort";
 }
 
+const SEARCH_URL = `${MEILI_URL}/indexes/${INDEX_NAME}/search`;
+const SEARCH_PARAMS = {
+  headers: {
+    "Content-Type": "application/json",
+    Authorization: `Bearer ${MEILI_KEY}`,
+  },
+};
+
 export default function () {
   const queryType = selectQueryType();
   const searchBody = buildSearchRequest(queryType);
 
   const startTime = Date.now();
 
-  const response = http.post(
-    `${MEILI_URL}/indexes/${INDEX_NAME}/search`,
-    JSON.stringify(searchBody),
-    {
-      headers: {
-        "Content-Type": "application/json",
-        Authorization: `Bearer ${MEILI_KEY}`,
-      },
-    }
-  );
+  const response = http.post(SEARCH_URL, searchBody, SEARCH_PARAMS);
 
   const latency = Date.now() - startTime;
   searchLatency.add(latency);
 
   const success = check(response, {
     "status is 200": (r) => r.status === 200,
+    // r.json(path) looks up one field without parsing the whole body into JS
     "has hits": (r) => {
       try {
-        const body = JSON.parse(r.body);
-        return body.hits !== undefined;
+        const hits = r.json("hits");
+        return hits !== undefined && hits !== null;
       } catch {
         return false;
       }
@@ -5,10 +5,19 @@
  * Usage:
  *   npx tsx dataset.ts --count 500000 --output products.ndjson
  *   npx tsx dataset.ts --count 500000 --output products.json --format json
+ *   npx tsx dataset.ts --count 500000 --output products.ndjson --workers 4
+ *   npx tsx dataset.ts --count 500000 --output products.ndjson.gz --workers 4
+ *
+ * Output paths ending in .gz are gzip-compressed while writing.
  */
 
-import { createWriteStream, writeFileSync } from "fs";
+import { once } from "events";
+import { createReadStream, createWriteStream, unlinkSync } from "fs";
+import type { Writable } from "stream";
+import { finished, pipeline } from "stream/promises";
 import { parseArgs } from "util";
+import { Worker, isMainThread, workerData } from "worker_threads";
+import { createGzip } from "zlib";
 
 // Product categories and brands
 const CATEGORIES = [
@@ -24,6 +33,9 @@ const CATEGORIES = [
   "Accessories",
 ] as const;
 
+// Lowercased category names, computed once and shared by every description
+const CATEGORIES_LOWER: readonly string[] = CATEGORIES.map((c) => c.toLowerCase());
+
 const BRANDS = [
   "Apple",
   "Samsung",
@@ -65,46 +77,90 @@ const ADJECTIVES = [
   "Digital",
 ] as const;
 
-// Product name templates per category
-const PRODUCT_TEMPLATES: Record<string, string[]> = {
+// Product name templates per category, as (brand, adjective, number) => title
+type TitleTemplate = (brand: string, adj: string, num: number) => string;
+
+const PRODUCT_TEMPLATES: Record<string, TitleTemplate[]> = {
   Laptops: [
-    "{brand} {adj} Laptop {num}",
-    "{brand} Notebook {adj} {num}",
-    "{brand} {adj} Book {num}",
+    (b, a, n) => `${b} ${a} Laptop ${n}`,
+    (b, a, n) => `${b} Notebook ${a} ${n}`,
+    (b, a, n) => `${b} ${a} Book ${n}`,
+  ],
+  Smartphones: [
+    (b, a, n) => `${b} Phone ${a} ${n}`,
+    (b, a, n) => `${b} ${a} ${n}`,
+    (b, a, n) => `${b} Mobile ${a} ${n}`,
+  ],
+  Tablets: [
+    (b, a, n) => `${b} Tab ${a} ${n}`,
+    (b, a, n) => `${b} Pad ${a} ${n}`,
+    (b, a, n) => `${b} ${a} Tablet ${n}`,
   ],
-  Smartphones: ["{brand} Phone {adj} {num}", "{brand} {adj} {num}", "{brand} Mobile {adj} {num}"],
-  Tablets: ["{brand} Tab {adj} {num}", "{brand} Pad {adj} {num}", "{brand} {adj} Tablet {num}"],
   Headphones: [
-    "{brand} {adj} Buds {num}",
-    "{brand} {adj} Headphones",
-    "{brand} {adj} Earbuds {num}",
+    (b, a, n) => `${b} ${a} Buds ${n}`,
+    (b, a) => `${b} ${a} Headphones`,
+    (b, a, n) => `${b} ${a} Earbuds ${n}`,
   ],
   Cameras: [
-    "{brand} {adj} Camera {num}",
-    "{brand} {adj} DSLR {num}",
-    "{brand} Mirrorless {adj} {num}",
+    (b, a, n) => `${b} ${a} Camera ${n}`,
+    (b, a, n) => `${b} ${a} DSLR ${n}`,
+    (b, a, n) => `${b} Mirrorless ${a} ${n}`,
+  ],
+  TVs: [
+    (b, a, n) => `${b} ${n}" ${a} TV`,
+    (b, a, n) => `${b} ${a} ${n}" Smart TV`,
+    (b, a, n) => `${b} OLED ${n}" ${a}`,
+  ],
+  Gaming: [
+    (b, a) => `${b} ${a} Controller`,
+    (b, a, n) => `${b} Gaming ${a} ${n}`,
+    (b, a) => `${b} ${a} Console`,
   ],
-  TVs: ['{brand} {num}" {adj} TV', '{brand} {adj} {num}" Smart TV', '{brand} OLED {num}" {adj}'],
-  Gaming: ["{brand} {adj} Controller", "{brand} Gaming {adj} {num}", "{brand} {adj} Console"],
   Wearables: [
-    "{brand} Watch {adj} {num}",
-    "{brand} {adj} Band {num}",
-    "{brand} Fitness {adj} {num}",
+    (b, a, n) => `${b} Watch ${a} ${n}`,
+    (b, a, n) => `${b} ${a} Band ${n}`,
+    (b, a, n) => `${b} Fitness ${a} ${n}`,
+  ],
+  Audio: [
+    (b, a) => `${b} ${a} Speaker`,
+    (b, a) => `${b} Soundbar ${a}`,
+    (b, a) => `${b} ${a} Home Audio`,
   ],
-  Audio: ["{brand} {adj} Speaker", "{brand} Soundbar {adj}", "{brand} {adj} Home Audio"],
   Accessories: [
-    "{brand} {adj} Charger",
-    "{brand} {adj} Cable",
-    "{brand} {adj} Case",
-    "{brand} {adj} Stand",
+    (b, a) => `${b} ${a} Charger`,
+    (b, a) => `${b} ${a} Cable`,
+    (b, a) => `${b} ${a} Case`,
+    (b, a) => `${b} ${a} Stand`,
   ],
 };
 
-// Description templates
-const DESCRIPTION_TEMPLATES = [
-  "The {title} delivers exceptional performance with cutting-edge technology. Features include {feature1}, {feature2}, and {feature3}. Perfect for {useCase}.",
-  "Experience the next level of {category} with the {title}. Equipped with {feature1} and {feature2}, this device offers unmatched {benefit} for {useCase}.",
-  "Introducing the {title} - designed for those who demand the best. With {feature1}, {feature2}, and {feature3}, enjoy superior {benefit}. Ideal for {useCase}.",
+// Title builders specialized per category index. Each closure captures its
+// category's template list and length, so the hot loop makes one indexed call
+// with no per-product category lookup.
+type TitleBuilder = (rng: () => number, brand: string, adj: string, num: number) => string;
+
+const TITLE_BUILDERS: TitleBuilder[] = CATEGORIES.map((c) => {
+  const templates = PRODUCT_TEMPLATES[c];
+  const n = templates.length;
+  return (rng, brand, adj, num) => templates[Math.floor(rng() * n)](brand, adj, num);
+});
+
+// Description templates, as (title, category, features, benefit, useCase) => description
+type DescriptionTemplate = (
+  title: string,
+  category: string,
+  features: string[],
+  benefit: string,
+  useCase: string
+) => string;
+
+const DESCRIPTION_TEMPLATES: DescriptionTemplate[] = [
+  (title, _category, [f1, f2, f3], _benefit, useCase) =>
+    `The ${title} delivers exceptional performance with cutting-edge technology. Features include ${f1}, ${f2}, and ${f3}. Perfect for ${useCase}.`,
+  (title, category, [f1, f2], benefit, useCase) =>
+    `Experience the next level of ${category} with the ${title}. Equipped with ${f1} and ${f2}, this device offers unmatched ${benefit} for ${useCase}.`,
+  (title, _category, [f1, f2, f3], benefit, useCase) =>
+    `Introducing the ${title} - designed for those who demand the best. With ${f1}, ${f2}, and ${f3}, enjoy superior ${benefit}. Ideal for ${useCase}.`,
 ];
 
 const FEATURES = [
@@ -125,6 +181,9 @@ const FEATURES = [
   "immersive sound",
 ];
 
+// Working copy of FEATURES that randomSample permutes in place
+const FEATURE_POOL: string[] = [...FEATURES];
+
 const BENEFITS = [
   "performance",
   "quality",
@@ -163,15 +222,47 @@ const PRICE_RANGES: Record<string, [number, number]> = {
   Accessories: [10, 150],
 };
 
-// Seeded random number generator (Mulberry32)
-function createRng(seed: number) {
-  let state = seed;
-  return () => {
-    state = (state + 0x6d2b79f5) | 0;
-    let t = state;
-    t = Math.imul(t ^ (t >>> 15), t | 1);
-    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
-    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+// Price bounds in integer cents, laid out by category index, so the hot loop
+// reads two typed arrays instead of looking up and destructuring a tuple
+const PRICE_MIN_CENTS = Int32Array.from(CATEGORIES, (c) => PRICE_RANGES[c][0] * 100);
+const PRICE_SPAN_CENTS = Int32Array.from(
+  CATEGORIES,
+  (c) => (PRICE_RANGES[c][1] - PRICE_RANGES[c][0]) * 100
+);
+
+// Number of draws the RNG produces per refill
+const RNG_BLOCK_SIZE = 4096;
+
+// RNG draws made by generateProduct, which always draws exactly this many so
+// a worker can start the sequence at any product id
+const DRAWS_PER_PRODUCT = 15;
+
+// Seeded random number generator (Mulberry32), starting `skip` draws in.
+// Draws are generated in blocks into a Float64Array, so the mixing loop runs
+// back to back and each call is just an index into the block. The sequence is
+// the same as drawing one value at a time. The state advances by a constant
+// per draw, so skipping ahead is a single multiply.
+function createRng(seed: number, skip = 0) {
+  let state = (seed + Math.imul(skip, 0x6d2b79f5)) | 0;
+  const block = new Float64Array(RNG_BLOCK_SIZE);
+  let pos = RNG_BLOCK_SIZE;
+
+  const refill = () => {
+    for (let j = 0; j < RNG_BLOCK_SIZE; j++) {
+      state = (state + 0x6d2b79f5) | 0;
+      let t = state;
+      t = Math.imul(t ^ (t >>> 15), t | 1);
+      t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+      block[j] = ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    }
+    pos = 0;
+  };
+
+  return (): number => {
+    if (pos === RNG_BLOCK_SIZE) {
+      refill();
+    }
+    return block[pos++];
   };
 }
 
@@ -179,9 +270,30 @@ function randomChoice<T>(arr: readonly T[], rng: () => number): T {
   return arr[Math.floor(rng() * arr.length)];
 }
 
-function randomSample<T>(arr: readonly T[], count: number, rng: () => number): T[] {
-  const shuffled = [...arr].sort(() => rng() - 0.5);
-  return shuffled.slice(0, count);
+// Swap positions in the partial shuffle, reused by every randomSample call
+const SAMPLE_SWAPS: number[] = [];
+
+// Partial Fisher-Yates: exactly `count` draws for `count` distinct, uniformly
+// chosen items. Shuffles `pool` in place, so the caller keeps one mutable pool
+// instead of copying the source per product, then undoes the swaps: the pool
+// is back in source order and each product's picks depend only on its own
+// draws, whichever product a worker starts at.
+function randomSample<T>(pool: T[], count: number, rng: () => number): T[] {
+  for (let i = 0; i < count; i++) {
+    const j = i + Math.floor(rng() * (pool.length - i));
+    SAMPLE_SWAPS[i] = j;
+    const picked = pool[j];
+    pool[j] = pool[i];
+    pool[i] = picked;
+  }
+  const sample = pool.slice(0, count);
+  for (let i = count - 1; i >= 0; i--) {
+    const j = SAMPLE_SWAPS[i];
+    const picked = pool[j];
+    pool[j] = pool[i];
+    pool[i] = picked;
+  }
+  return sample;
 }
 
 interface Product {
@@ -197,33 +309,26 @@ interface Product {
 }
 
 function generateProduct(id: number, rng: () => number): Product {
-  const category = randomChoice(CATEGORIES, rng);
+  const catIdx = Math.floor(rng() * CATEGORIES.length);
+  const category = CATEGORIES[catIdx];
   const brand = randomChoice(BRANDS, rng);
   const adj = randomChoice(ADJECTIVES, rng);
   const num = Math.floor(rng() * 20) + 1;
 
   // Generate title
-  const template = randomChoice(PRODUCT_TEMPLATES[category], rng);
-  const title = template
-    .replace("{brand}", brand)
-    .replace("{adj}", adj)
-    .replace("{num}", String(num));
+  const title = TITLE_BUILDERS[catIdx](rng, brand, adj, num);
 
-  // Generate description
+  // Generate description (benefit and use case are always drawn, even when the
+  // chosen template does not use them, to keep the RNG sequence stable)
   const descTemplate = randomChoice(DESCRIPTION_TEMPLATES, rng);
-  const features = randomSample(FEATURES, 3, rng);
-  const description = descTemplate
-    .replace("{title}", title)
-    .replace("{category}", category.toLowerCase())
-    .replace("{feature1}", features[0])
-    .replace("{feature2}", features[1])
-    .replace("{feature3}", features[2])
-    .replace("{benefit}", randomChoice(BENEFITS, rng))
-    .replace("{useCase}", randomChoice(USE_CASES, rng));
-
-  // Generate price
-  const [minPrice, maxPrice] = PRICE_RANGES[category];
-  const price = Math.round((minPrice + rng() * (maxPrice - minPrice)) * 100) / 100;
+  const features = randomSample(FEATURE_POOL, 3, rng);
+  const benefit = randomChoice(BENEFITS, rng);
+  const useCase = randomChoice(USE_CASES, rng);
+  const description = descTemplate(title, CATEGORIES_LOWER[catIdx], features, benefit, useCase);
+
+  // Generate price: draw whole cents, then scale once (always <= 2 decimals)
+  const priceCents = PRICE_MIN_CENTS[catIdx] + Math.round(rng() * PRICE_SPAN_CENTS[catIdx]);
+  const price = priceCents / 100;
 
   return {
     id,
@@ -232,51 +337,181 @@ function generateProduct(id: number, rng: () => number): Product {
     brand,
     category,
     price,
-    rating: Math.round((3 + rng() * 2) * 10) / 10,
+    rating: Math.round(30 + rng() * 20) / 10, // 3.0-5.0 in tenths
     reviews_count: Math.floor(rng() * 5000),
     in_stock: rng() > 0.1, // 90% in stock
   };
 }
 
-async function generateDataset(
-  count: number,
-  output: string,
-  format: "json" | "ndjson",
-  seed: number
-): Promise<void> {
-  const rng = createRng(seed);
-  console.log(`Generating ${count.toLocaleString()} products...`);
+// Flush buffered lines to the stream once roughly 1 MiB has accumulated
+const FLUSH_CHARS = 1 << 20;
+
+// Log progress roughly every this many products (checked only on flush)
+const PROGRESS_EVERY = 100000;
+
+// Encoded JSON strings for the closed brand/category vocabularies, built once
+// so the serializer only escapes the free-text fields per product
+const ENCODED_VALUES = new Map<string, string>(
+  [...BRANDS, ...CATEGORIES].map((v) => [v, JSON.stringify(v)])
+);
+
+// Fixed-shape serializer: keys are known up front, so only the string fields
+// need escaping. Produces the same bytes as JSON.stringify(product).
+function serializeProduct(p: Product): string {
+  return (
+    `{"id":${p.id},"title":${JSON.stringify(p.title)},` +
+    `"description":${JSON.stringify(p.description)},` +
+    `"brand":${ENCODED_VALUES.get(p.brand)},"category":${ENCODED_VALUES.get(p.category)},` +
+    `"price":${p.price},"rating":${p.rating},"reviews_count":${p.reviews_count},` +
+    `"in_stock":${p.in_stock}}`
+  );
+}
+
+// Range of product ids generated by one writer (main thread or worker)
+interface WriteJob {
+  output: string;
+  format: "json" | "ndjson";
+  firstId: number;
+  lastId: number;
+  seed: number;
+  gzip: boolean;
+  logProgress: boolean;
+}
+
+// Open an output file, optionally through a gzip stream. `done` resolves once
+// everything written to `stream` has been flushed to disk.
+function openOutput(path: string, gzip: boolean): { stream: Writable; done: Promise<void> } {
+  const file = createWriteStream(path);
+  if (!gzip) {
+    return { stream: file, done: finished(file) };
+  }
+  const gz = createGzip();
+  return { stream: gz, done: pipeline(gz, file) };
+}
+
+// Stream products to file as they are generated, one write per ~1 MiB chunk.
+// Neither format keeps the products in memory: the JSON array is written as
+// "[" + items joined by "," + "]", the same bytes JSON.stringify would emit.
+async function writeProducts(job: WriteJob): Promise<void> {
+  const rng = createRng(job.seed, (job.firstId - 1) * DRAWS_PER_PRODUCT);
+  const json = job.format === "json";
 
-  if (format === "ndjson") {
-    // Stream to file for memory efficiency
-    const stream = createWriteStream(output);
+  const { stream, done } = openOutput(job.output, job.gzip);
+  let chunk = json ? "[" : "";
+  let nextProgress = job.firstId + PROGRESS_EVERY - 1;
 
-    for (let i = 1; i <= count; i++) {
-      const product = generateProduct(i, rng);
-      stream.write(JSON.stringify(product) + "\n");
+  for (let i = job.firstId; i <= job.lastId; i++) {
+    const line = serializeProduct(generateProduct(i, rng));
+    if (json) {
+      chunk += i === job.firstId ? line : "," + line;
+    } else {
+      chunk += line + "\n";
+    }
+
+    if (chunk.length >= FLUSH_CHARS) {
+      if (!stream.write(chunk)) {
+        await once(stream, "drain");
+      }
+      chunk = "";
 
-      if (i % 100000 === 0) {
+      // Progress is reported from the flush path, not on every product
+      if (job.logProgress && i >= nextProgress) {
         console.log(`  Generated ${i.toLocaleString()} products...`);
+        nextProgress += PROGRESS_EVERY;
       }
     }
+  }
 
-    await new Promise<void>((resolve, reject) => {
-      stream.end(() => resolve());
-      stream.on("error", reject);
-    });
-  } else {
-    // JSON format - build array in memory
-    const products: Product[] = [];
-
-    for (let i = 1; i <= count; i++) {
-      products.push(generateProduct(i, rng));
+  stream.end(json ? chunk + "]" : chunk);
+  await done;
+}
 
-      if (i % 100000 === 0) {
-        console.log(`  Generated ${i.toLocaleString()} products...`);
+function runWorker(job: WriteJob): Promise<void> {
+  return new Promise((resolve, reject) => {
+    // execArgv carries tsx's loader flags, so the worker can load this .ts file
+    const worker = new Worker(new URL(import.meta.url), {
+      workerData: job,
+      execArgv: process.execArgv,
+    });
+    worker.once("error", reject);
+    worker.once("exit", (code) => {
+      if (code === 0) {
+        resolve();
+      } else {
+        reject(new Error(`Dataset worker exited with code ${code}`));
       }
+    });
+  });
+}
+
+// Split ids into contiguous ranges, one per worker. Each worker starts the
+// RNG sequence at its first id and writes a part file; parts are then
+// concatenated in id order, giving the same products as a single thread.
+// With gzip, each worker compresses its own part in parallel; concatenated
+// gzip members form a valid multi-member gzip file.
+async function writeNdjsonParallel(
+  count: number,
+  output: string,
+  seed: number,
+  workers: number,
+  gzip: boolean
+): Promise<void> {
+  const perWorker = Math.ceil(count / workers);
+  const jobs: WriteJob[] = [];
+  for (let w = 0; w < workers; w++) {
+    const firstId = w * perWorker + 1;
+    const lastId = Math.min(count, (w + 1) * perWorker);
+    if (firstId > lastId) {
+      break;
     }
+    jobs.push({
+      output: `${output}.part${w}`,
+      format: "ndjson",
+      firstId,
+      lastId,
+      seed,
+      gzip,
+      logProgress: false,
+    });
+  }
 
-    writeFileSync(output, JSON.stringify(products));
+  await Promise.all(jobs.map(runWorker));
+  console.log(`  Generated ${count.toLocaleString()} products on ${jobs.length} workers`);
+
+  const { stream, done } = openOutput(output, false);
+  for (const job of jobs) {
+    await pipeline(createReadStream(job.output), stream, { end: false });
+    unlinkSync(job.output);
+  }
+  stream.end();
+  await done;
+}
+
+async function generateDataset(
+  count: number,
+  output: string,
+  format: "json" | "ndjson",
+  seed: number,
+  workers: number
+): Promise<void> {
+  console.log(`Generating ${count.toLocaleString()} products...`);
+  const gzip = output.endsWith(".gz");
+
+  if (workers > 1) {
+    if (format !== "ndjson") {
+      throw new Error("--workers is only supported with --format ndjson");
+    }
+    await writeNdjsonParallel(count, output, seed, workers, gzip);
+  } else {
+    await writeProducts({
+      output,
+      format,
+      firstId: 1,
+      lastId: count,
+      seed,
+      gzip,
+      logProgress: true,
+    });
   }
 
   const { statSync } = await import("fs");
@@ -284,22 +519,35 @@ async function generateDataset(
   console.log(`Done! File: ${output} (${sizeMb.toFixed(1)} MB)`);
 }
 
-// Main
-const { values } = parseArgs({
-  options: {
-    count: { type: "string", short: "c", default: "500000" },
-    output: { type: "string", short: "o", default: "products.ndjson" },
-    format: { type: "string", short: "f", default: "ndjson" },
-    seed: { type: "string", short: "s", default: "42" },
-  },
-});
+function main(): void {
+  const { values } = parseArgs({
+    options: {
+      count: { type: "string", short: "c", default: "500000" },
+      output: { type: "string", short: "o", default: "products.ndjson" },
+      format: { type: "string", short: "f", default: "ndjson" },
+      seed: { type: "string", short: "s", default: "42" },
+      workers: { type: "string", short: "w", default: "1" },
+    },
+  });
 
-const count = parseInt(values.count!, 10);
-const output = values.output!;
-const format = values.format as "json" | "ndjson";
-const seed = parseInt(values.seed!, 10);
+  const count = parseInt(values.count!, 10);
+  const output = values.output!;
+  const format = values.format as "json" | "ndjson";
+  const seed = parseInt(values.seed!, 10);
+  const workers = Math.max(1, parseInt(values.workers!, 10));
 
-generateDataset(count, output, format, seed).catch((err) => {
-  console.error(err);
-  process.exit(1);
-});
+  generateDataset(count, output, format, seed, workers).catch((err) => {
+    console.error(err);
+    process.exit(1);
+  });
+}
+
+// Main (worker threads re-enter this file and only write their id range)
+if (isMainThread) {
+  main();
+} else {
+  writeProducts(workerData as WriteJob).catch((err) => {
+    console.error(err);
+    process.exit(1);
+  });
+}
@@ -19,31 +19,48 @@ Usage:
 
 import argparse
 import json
+import queue
+import shlex
 import sys
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 import optuna
 from optuna.samplers import TPESampler
+from python_terraform import IsFlagged
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from common import (
+    ResultIndex,
+    copy_to_vm,
     destroy_all,
+    destroy_workspace,
     get_terraform,
-    get_tf_output,
+    get_tf_outputs,
     load_results,
+    make_worker_configs,
+    open_study_storage,
     run_ssh_command,
-    save_results,
+    terraform_vars,
     wait_for_vm_ready,
+    write_text_atomic,
 )
 from pricing import DiskConfig, calculate_vm_cost, filter_valid_ram, get_cloud_pricing
 
 RESULTS_DIR = Path(__file__).parent
+STUDY_JOURNAL = RESULTS_DIR / "study.log"
+# Pre-journal SQLite study, migrated into STUDY_JOURNAL on first run
 STUDY_DB = RESULTS_DIR / "study.db"
 BENCHMARK_SCRIPT = RESULTS_DIR / "benchmark.js"
+# Shell/Node scripts run on the benchmark VM; installed by install_scripts()
+SCRIPTS_DIR = RESULTS_DIR / "scripts"
+REMOTE_SCRIPTS_DIR = "/usr/local/meili-scripts"
 DATASET_SCRIPT = RESULTS_DIR / "dataset.py"
 
 # Available optimization metrics
@@ -61,6 +78,19 @@ DISK_SIZE_GB = 100
 
 # Dataset config
 DATASET_SIZE = 500000  # 500K products
+# Generated dataset and its gzipped upload batches are cached on the benchmark
+# VM (the generator is seeded, so the output never changes for a given size)
+DATASET_CACHE_DIR = f"/var/cache/meili-dataset-{DATASET_SIZE}"
+
+# k6 benchmark length, and the points (seconds in) where the metric so far is
+# reported to the pruner so bad trials stop early
+BENCHMARK_DURATION_S = 60
+BENCHMARK_CHECKPOINTS_S = (10, 30)
+
+# While optimizing indexing time, indexing progress is polled this often and a
+# trial is pruned once its extrapolated time exceeds this multiple of the best
+INDEXING_POLL_S = 5
+INDEXING_PRUNE_FACTOR = 2.0
 
 TERRAFORM_BASE = Path(__file__).parent.parent.parent / "terraform"
 
@@ -72,6 +102,7 @@ class CloudConfig:
     cpu_cost: float  # Cost per vCPU per month
     ram_cost: float  # Cost per GB RAM per month
     disk_cost_multipliers: dict[str, float]
+    environment_name: str | None = None  # Resource name suffix for parallel workers
 
 
 def _make_cloud_config(name: str) -> CloudConfig:
@@ -172,8 +203,8 @@ def wait_for_meilisearch_ready(
     """Wait for Meilisearch to be healthy."""
     print("  Waiting for Meilisearch to be ready...")
 
-    start = time.time()
-    while time.time() - start < timeout:
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
         try:
             code, output = run_ssh_command(
                 vm_ip,
@@ -182,7 +213,7 @@ def wait_for_meilisearch_ready(
                 jump_host=jump_host,
             )
             if code == 0 and "available" in output.lower():
-                print(f"  Meilisearch ready! ({time.time() - start:.0f}s)")
+                print(f"  Meilisearch ready! ({time.monotonic() - start:.0f}s)")
                 return True
         except Exception:
             pass
@@ -192,132 +223,121 @@ def wait_for_meilisearch_ready(
     return False
 
 
+def install_scripts(benchmark_ip: str) -> None:
+    """Copy SCRIPTS_DIR and the k6 script to REMOTE_SCRIPTS_DIR on the benchmark VM."""
+    run_ssh_command(benchmark_ip, f"mkdir -p {REMOTE_SCRIPTS_DIR}", timeout=30)
+    files = [*sorted(SCRIPTS_DIR.iterdir()), BENCHMARK_SCRIPT]
+    code, output = copy_to_vm(benchmark_ip, files, REMOTE_SCRIPTS_DIR)
+    if code != 0:
+        raise RuntimeError(f"Failed to install scripts on benchmark VM: {output}")
+
+
+def remote_script(name: str, *args: object) -> str:
+    """Shell command running an installed script with quoted arguments."""
+    return shlex.join([f"{REMOTE_SCRIPTS_DIR}/{name}", *map(str, args)])
+
+
+def generate_dataset(benchmark_ip: str) -> bool:
+    """Generate the dataset and its upload batches into DATASET_CACHE_DIR."""
+    gen_cmd = remote_script("generate_dataset.sh", DATASET_CACHE_DIR, DATASET_SIZE)
+    # Stream the generator's progress lines instead of waiting for the end
+    code, output = run_ssh_command(
+        benchmark_ip,
+        gen_cmd,
+        timeout=300,
+        line_callback=lambda line: print(f"    {line}"),
+    )
+    if code != 0:
+        print(f"  Failed to generate dataset: {output}")
+        return False
+    return True
+
+
+def ensure_dataset(benchmark_ip: str) -> bool:
+    """Generate the dataset unless an earlier trial on this VM already did."""
+    gen_start = time.monotonic()
+    check_cmd = f"test -s {DATASET_CACHE_DIR}/products.ndjson && test -s {DATASET_CACHE_DIR}/batch_aa.gz"
+    cached, _ = run_ssh_command(benchmark_ip, check_cmd, timeout=30)
+    if cached == 0:
+        print(f"  Using cached dataset in {DATASET_CACHE_DIR}")
+        return True
+    if not generate_dataset(benchmark_ip):
+        return False
+    gen_elapsed = int(time.monotonic() - gen_start)
+    print(f"  Generated {DATASET_SIZE:,} products in {gen_elapsed}s")
+    return True
+
+
 def upload_and_index_dataset(
-    benchmark_ip: str, meili_ip: str, jump_host: str | None = None
+    benchmark_ip: str,
+    meili_ip: str,
+    jump_host: str | None = None,
+    on_progress: Callable[[float], None] | None = None,
 ) -> float:
-    """Generate, upload and index the dataset. Returns indexing time in seconds."""
+    """Generate (once per VM), upload and index the dataset. Returns indexing time in seconds.
+
+    If on_progress is given, indexing is polled every INDEXING_POLL_S and it is
+    called with the total indexing time extrapolated from the finished upload
+    batches. It may raise (e.g. optuna.TrialPruned) to cancel indexing early.
+    """
     print(f"  Generating and indexing {DATASET_SIZE:,} products...")
-    gen_start = time.time()
-
-    # Generate dataset on benchmark VM using Node.js
-    gen_cmd = f"""
-cd /tmp && node << 'JSEOF'
-const fs = require('fs');
-
-// Seeded RNG (Mulberry32)
-let seed = 42;
-function rng() {{
-  seed = (seed + 0x6d2b79f5) | 0;
-  let t = seed;
-  t = Math.imul(t ^ (t >>> 15), t | 1);
-  t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
-  return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
-}}
-
-const pick = arr => arr[Math.floor(rng() * arr.length)];
-
-const CATEGORIES = ["Laptops", "Smartphones", "Tablets", "Headphones", "Cameras", "TVs", "Gaming", "Wearables", "Audio", "Accessories"];
-const BRANDS = ["Apple", "Samsung", "Sony", "LG", "Dell", "HP", "Lenovo", "Asus", "Acer", "Microsoft", "Google", "Bose", "JBL", "Canon", "Nikon"];
-const ADJECTIVES = ["Pro", "Ultra", "Max", "Plus", "Lite", "Mini", "Elite", "Premium", "Advanced", "Essential"];
-const PRICE_BASE = {{Laptops: 1000, Smartphones: 500, Tablets: 400, Headphones: 100, Cameras: 800, TVs: 600, Gaming: 200, Wearables: 200, Audio: 150, Accessories: 30}};
-
-function genProduct(i) {{
-  const cat = pick(CATEGORIES);
-  const brand = pick(BRANDS);
-  const adj = pick(ADJECTIVES);
-  const singular = cat.endsWith('s') ? cat.slice(0, -1) : cat;
-  return {{
-    id: i,
-    title: `${{brand}} ${{adj}} ${{singular}} ${{i % 20}}`,
-    description: `High-quality ${{cat.toLowerCase()}} from ${{brand}} with ${{adj.toLowerCase()}} features`,
-    brand,
-    category: cat,
-    price: Math.round(PRICE_BASE[cat] * (0.5 + rng() * 2) * 100) / 100,
-    rating: Math.round((3 + rng() * 2) * 10) / 10,
-    in_stock: rng() > 0.1
-  }};
-}}
-
-const stream = fs.createWriteStream('/tmp/products.ndjson');
-const total = {DATASET_SIZE};
-for (let i = 1; i <= total; i++) {{
-  stream.write(JSON.stringify(genProduct(i)) + '\\n');
-  if (i % 100000 === 0) console.log(`Generated ${{i}} products`);
-}}
-stream.end(() => console.log(`Done generating ${{total}} products`));
-JSEOF
-"""
-    code, output = run_ssh_command(benchmark_ip, gen_cmd, timeout=300)
-    if code != 0:
-        print(f"  Failed to generate dataset: {output}")
+    if not ensure_dataset(benchmark_ip):
         return -1
-    gen_elapsed = int(time.time() - gen_start)
-    print(f"  Generated {DATASET_SIZE:,} products in {gen_elapsed}s")
 
     # Create index with settings
-    create_cmd = f"""
-curl -sf -X POST 'http://{meili_ip}:7700/indexes' \\
-  -H 'Authorization: Bearer {MASTER_KEY}' \\
-  -H 'Content-Type: application/json' \\
-  --data '{{"uid": "products", "primaryKey": "id"}}'
-"""
-    run_ssh_command(benchmark_ip, create_cmd, timeout=30)
-
-    # Configure index settings
-    settings_cmd = f"""
-curl -sf -X PATCH 'http://{meili_ip}:7700/indexes/products/settings' \\
-  -H 'Authorization: Bearer {MASTER_KEY}' \\
-  -H 'Content-Type: application/json' \\
-  --data '{{
-    "searchableAttributes": ["title", "description", "brand"],
-    "filterableAttributes": ["category", "brand", "price", "rating", "in_stock"],
-    "sortableAttributes": ["price", "rating"]
-  }}'
-"""
-    run_ssh_command(benchmark_ip, settings_cmd, timeout=30)
-    time.sleep(2)
-
-    # Upload documents in batches
-    start_time = time.time()
-
-    upload_cmd = f"""
-split -l 50000 /tmp/products.ndjson /tmp/batch_
-for f in /tmp/batch_*; do
-  echo "Uploading $f..."
-  curl -sf -X POST "http://{meili_ip}:7700/indexes/products/documents" \\
-    -H "Authorization: Bearer {MASTER_KEY}" \\
-    -H "Content-Type: application/x-ndjson" \\
-    --data-binary @"$f"
-  echo ""
-done
-"""
+    meili_url = f"http://{meili_ip}:7700"
+    configure_cmd = remote_script("configure_index.sh", meili_url, MASTER_KEY)
+    run_ssh_command(benchmark_ip, configure_cmd, timeout=30)
+    # No wait needed: Meilisearch runs tasks in order, so the uploads below
+    # are indexed only after the index is created and configured
+
+    # Upload gzipped batches over a single keep-alive connection
+    start_time = time.monotonic()
+
+    upload_cmd = remote_script(
+        "upload_batches.sh", meili_url, MASTER_KEY, DATASET_CACHE_DIR
+    )
     code, output = run_ssh_command(benchmark_ip, upload_cmd, timeout=600)
     if code != 0:
         print(f"  Failed to upload dataset: {output}")
         return -1
 
-    # Wait for indexing to complete
+    task_uids = []
+    for line in output.splitlines():
+        try:
+            task_uids.append(json.loads(line)["taskUid"])
+        except (ValueError, KeyError, TypeError):
+            continue
+    if not task_uids:
+        print(f"  No indexing tasks returned by upload: {output[:500]}")
+        return -1
+
     print("  Waiting for indexing to complete...")
-    wait_cmd = f"""
-while true; do
-  status=$(curl -sf 'http://{meili_ip}:7700/tasks?statuses=processing,enqueued' \\
-    -H 'Authorization: Bearer {MASTER_KEY}' | python3 -c "import sys,json; d=json.load(sys.stdin); print(d.get('total', 0))")
-  if [ "$status" = "0" ]; then
-    echo "Indexing complete"
-    break
-  fi
-  echo "Tasks remaining: $status"
-  sleep 2
-done
-"""
+    uids = ",".join(str(uid) for uid in task_uids)
+    if on_progress:
+        try:
+            watch_indexing(benchmark_ip, meili_url, uids, start_time, on_progress)
+        except BaseException:
+            cancel_cmd = (
+                f"curl -sf -X POST '{meili_url}/tasks/cancel?uids={uids}' "
+                f"-H 'Authorization: Bearer {MASTER_KEY}'"
+            )
+            run_ssh_command(benchmark_ip, cancel_cmd, timeout=30)
+            raise
+
+    # Wait for the upload tasks (backoff polling), then check none failed
+    wait_cmd = remote_script("wait_for_tasks.sh", meili_url, MASTER_KEY, uids)
     code, output = run_ssh_command(benchmark_ip, wait_cmd, timeout=600)
+    if code != 0:
+        print(f"  Indexing failed: {output}")
+        return -1
 
-    indexing_time = time.time() - start_time
+    indexing_time = time.monotonic() - start_time
     print(f"  Indexing completed in {indexing_time:.1f}s")
 
     # Verify document count
     stats_cmd = f"""
-curl -sf 'http://{meili_ip}:7700/indexes/products/stats' \\
+curl -sf '{meili_url}/indexes/products/stats' \\
   -H 'Authorization: Bearer {MASTER_KEY}'
 """
     code, output = run_ssh_command(benchmark_ip, stats_cmd, timeout=30)
@@ -331,50 +351,38 @@ curl -sf 'http://{meili_ip}:7700/indexes/products/stats' \\
     return indexing_time
 
 
-def run_k6_benchmark(
-    benchmark_ip: str, meili_ip: str, vus: int = 10, duration: int = 60
-) -> BenchmarkResult:
-    """Run k6 benchmark from benchmark VM."""
-    print(f"  Running k6 benchmark (vus={vus}, duration={duration}s)...")
-
-    # Upload k6 script
-    with open(BENCHMARK_SCRIPT) as f:
-        script_content = f.read()
-
-    upload_cmd = f"cat > /tmp/benchmark.js << 'EOFSCRIPT'\n{script_content}\nEOFSCRIPT"
-    run_ssh_command(benchmark_ip, upload_cmd, timeout=30)
-
-    # Run k6
-    k6_cmd = f"""
-K6_SUMMARY_TREND_STATS="avg,min,med,max,p(90),p(95),p(99)" k6 run /tmp/benchmark.js \\
-  -e MEILI_URL=http://{meili_ip}:7700 \\
-  -e MEILI_KEY={MASTER_KEY} \\
-  -e VUS={vus} \\
-  -e DURATION={duration}s \\
-  --summary-export=/tmp/k6_results.json \\
-  2>&1
-"""
-    code, output = run_ssh_command(benchmark_ip, k6_cmd, timeout=duration + 60)
-
-    if code != 0:
-        return BenchmarkResult(error=f"k6 failed: {output[:500]}")
-
-    # Parse results
-    cat_cmd = "cat /tmp/k6_results.json"
-    code, results_json = run_ssh_command(benchmark_ip, cat_cmd, timeout=60)
+def watch_indexing(
+    benchmark_ip: str,
+    meili_url: str,
+    uids: str,
+    start_time: float,
+    on_progress: Callable[[float], None],
+    timeout: int = 600,
+) -> None:
+    """Pass extrapolated indexing times to on_progress until all tasks finish.
+
+    Upload batches are equal-sized, so the share of finished tasks stands in
+    for the share of the dataset indexed.
+    """
+    total = uids.count(",") + 1
+    progress_cmd = remote_script("index_progress.sh", meili_url, MASTER_KEY, uids)
+    while time.monotonic() - start_time < timeout:
+        time.sleep(INDEXING_POLL_S)
+        code, output = run_ssh_command(benchmark_ip, progress_cmd, timeout=30)
+        try:
+            done = int(output.split()[-1]) if code == 0 else 0
+        except (ValueError, IndexError):
+            continue
+        if done >= total:
+            return
+        if done:
+            on_progress((time.monotonic() - start_time) * total / done)
 
-    if code != 0:
-        return BenchmarkResult(error="Failed to get k6 results")
 
+def parse_k6_summary(summary_json: str) -> BenchmarkResult:
+    """Build a BenchmarkResult from a k6 --summary-export JSON document."""
     try:
-        # Use raw_decode to extract first JSON object (handles extra data after JSON)
-        decoder = json.JSONDecoder()
-        content = results_json.strip()
-        start_idx = content.find("{")
-        if start_idx == -1:
-            return BenchmarkResult(error="No JSON found in k6 results")
-
-        json_content, _ = decoder.raw_decode(content, start_idx)
+        json_content = json.loads(summary_json)
 
         # Extract metrics from parsed JSON
         metrics = json_content.get("metrics", {})
@@ -403,6 +411,190 @@ K6_SUMMARY_TREND_STATS="avg,min,med,max,p(90),p(95),p(99)" k6 run /tmp/benchmark
         return BenchmarkResult(error=f"Failed to parse results: {e}")
 
 
+def read_k6_progress(benchmark_ip: str, elapsed: float) -> BenchmarkResult | None:
+    """QPS and p95 so far, from the running k6's REST API."""
+    code, output = run_ssh_command(
+        benchmark_ip, remote_script("k6_progress.sh"), timeout=60
+    )
+    if code != 0:
+        return None
+    try:
+        latency, iterations = (
+            json.loads(line)["data"]["attributes"]["sample"]
+            for line in output.splitlines()[-2:]
+        )
+        count = int(iterations["count"])
+        p95 = float(latency["p(95)"])
+    except (ValueError, KeyError, TypeError):
+        return None  # k6 not serving its API yet
+    if count == 0:
+        return None
+    return BenchmarkResult(qps=count / elapsed, p95_ms=p95)
+
+
+def run_k6_benchmark(
+    benchmark_ip: str,
+    meili_ip: str,
+    vus: int = 10,
+    duration: int = 60,
+    checkpoints: tuple[int, ...] = (),
+    on_checkpoint: Callable[[int, BenchmarkResult], None] | None = None,
+) -> BenchmarkResult:
+    """Run k6 benchmark from benchmark VM.
+
+    k6 runs in the background with its REST API enabled. At each checkpoint
+    (seconds since start) the metrics so far are read from that API and passed
+    to on_checkpoint, which may raise (e.g. optuna.TrialPruned) to stop the run
+    early. The final result comes from k6's --summary-export.
+    """
+    print(f"  Running k6 benchmark (vus={vus}, duration={duration}s)...")
+
+    start_cmd = remote_script(
+        "start_k6.sh", f"http://{meili_ip}:7700", MASTER_KEY, vus, duration
+    )
+    code, output = run_ssh_command(benchmark_ip, start_cmd, timeout=30)
+    if code != 0:
+        return BenchmarkResult(error=f"Failed to start k6: {output[-500:]}")
+    start = time.monotonic()
+
+    try:
+        for checkpoint in checkpoints:
+            time.sleep(max(0.0, start + checkpoint - time.monotonic()))
+            progress = read_k6_progress(benchmark_ip, time.monotonic() - start)
+            if progress and on_checkpoint:
+                on_checkpoint(checkpoint, progress)
+    except BaseException:
+        run_ssh_command(benchmark_ip, "pkill -x k6", timeout=30)
+        raise
+
+    # Wait for k6 to finish; prints the summary JSON (k6's output on failure)
+    remaining = max(0, int(start + duration - time.monotonic()))
+    code, output = run_ssh_command(
+        benchmark_ip, remote_script("wait_k6.sh"), timeout=remaining + 60
+    )
+
+    if code != 0:
+        return BenchmarkResult(error=f"k6 failed: {output[-500:]}")
+
+    return parse_k6_summary(output)
+
+
+def indexing_pruner(trial: optuna.Trial, metric: str) -> Callable[[float], None] | None:
+    """on_progress callback for upload_and_index_dataset when optimizing indexing time.
+
+    Prunes the trial once its extrapolated indexing time is over
+    INDEXING_PRUNE_FACTOR times the best so far. The benchmark checkpoints
+    don't report this metric, so this is the only early stop for it.
+    """
+    if metric != "indexing_time":
+        return None
+    try:
+        best = trial.study.best_value
+    except ValueError:
+        return None  # No completed trial to compare with yet
+
+    def check(extrapolated: float) -> None:
+        if extrapolated > INDEXING_PRUNE_FACTOR * best:
+            print(f"  Pruned during indexing: ~{extrapolated:.0f}s vs best {best:.0f}s")
+            raise optuna.TrialPruned(f"Indexing extrapolated to {extrapolated:.0f}s")
+
+    return check
+
+
+def benchmark_metric_value(
+    result: BenchmarkResult, metric: str, cost: float, indexing_time: float = 0
+) -> float:
+    """Objective value for a benchmark result."""
+    if metric == "p95_ms":
+        return result.p95_ms
+    elif metric == "cost_efficiency":
+        return result.qps / cost if cost > 0 else 0
+    elif metric == "indexing_time":
+        return indexing_time
+    else:
+        return result.qps
+
+
+def run_pruned_benchmark(
+    trial: optuna.Trial,
+    benchmark_ip: str,
+    meili_ip: str,
+    metric: str,
+    cost: float,
+    vus: int,
+) -> BenchmarkResult:
+    """Run k6, reporting the metric so far to the pruner at each checkpoint.
+
+    Raises optuna.TrialPruned when the pruner decides the trial is unpromising.
+    Indexing time is known before the benchmark starts, so that metric is not
+    reported (indexing_pruner stops slow indexing instead).
+    """
+
+    def report(elapsed: int, progress: BenchmarkResult) -> None:
+        if metric == "indexing_time":
+            return
+        value = benchmark_metric_value(progress, metric, cost)
+        trial.report(value, step=elapsed)
+        if trial.should_prune():
+            print(f"  Pruned after {elapsed}s: {value:.2f} ({metric})")
+            raise optuna.TrialPruned(f"Pruned at {elapsed}s")
+
+    return run_k6_benchmark(
+        benchmark_ip,
+        meili_ip,
+        vus=vus,
+        duration=BENCHMARK_DURATION_S,
+        checkpoints=BENCHMARK_CHECKPOINTS_S,
+        on_checkpoint=report,
+    )
+
+
+def make_sampler(
+    n_trials: int, constant_liar: bool = False, n_startup_trials: int | None = None
+) -> TPESampler:
+    """Multivariate TPE, which models the CPU x RAM interaction jointly.
+
+    group=True lets it handle the CPU-specific ram_gb_cpu{N} parameters.
+    n_startup_trials defaults to max(5, n_trials // 4).
+    """
+    if n_startup_trials is None:
+        n_startup_trials = max(5, n_trials // 4)
+    return TPESampler(
+        seed=42,
+        multivariate=True,
+        group=True,
+        n_startup_trials=n_startup_trials,
+        constant_liar=constant_liar,
+    )
+
+
+def warm_start_configs(infra_config: dict) -> list[dict]:
+    """Meilisearch config guesses for a host, used to seed the config study.
+
+    Indexing memory is the largest option within a quarter of RAM; threads
+    are pinned to the vCPU count, and also left on auto.
+    """
+    space = get_config_search_space()
+    ram_mb = infra_config.get("ram_gb", 0) * 1024
+    cpu = infra_config.get("cpu", 0)
+    mem_options = space["max_indexing_memory_mb"]
+    mem = max([m for m in mem_options if m <= ram_mb // 4], default=mem_options[0])
+    threads = max([t for t in space["max_indexing_threads"] if t <= cpu], default=0)
+    configs = [{"max_indexing_memory_mb": mem, "max_indexing_threads": threads}]
+    if threads != 0:
+        configs.append({"max_indexing_memory_mb": mem, "max_indexing_threads": 0})
+    return configs
+
+
+def make_pruner() -> optuna.pruners.BasePruner:
+    """Hyperband over benchmark seconds, matching BENCHMARK_CHECKPOINTS_S."""
+    return optuna.pruners.HyperbandPruner(
+        min_resource=BENCHMARK_CHECKPOINTS_S[0],
+        max_resource=BENCHMARK_DURATION_S,
+        reduction_factor=3,
+    )
+
+
 def ensure_infra(
     cloud_config: CloudConfig, infra_config: dict | None = None
 ) -> tuple[str, str]:
@@ -411,8 +603,7 @@ def ensure_infra(
 
     tf = get_terraform(cloud_config.terraform_dir)
 
-    meili_ip = get_tf_output(tf, "meilisearch_vm_ip")
-    benchmark_ip = get_tf_output(tf, "benchmark_vm_ip")
+    meili_ip, benchmark_ip = get_tf_outputs(tf, "meilisearch_vm_ip", "benchmark_vm_ip")
 
     if meili_ip and benchmark_ip:
         print(f"  Found Meilisearch VM: {meili_ip}")
@@ -424,19 +615,21 @@ def ensure_infra(
                 timeout=10,
                 jump_host=benchmark_ip,
             )
-            if code == 0:
-                return benchmark_ip, meili_ip
         except Exception:
-            pass
+            code = -1
+        if code == 0:
+            install_scripts(benchmark_ip)
+            return benchmark_ip, meili_ip
 
     print("  Creating infrastructure...")
-    tf_start = time.time()
-    tf_vars: dict[str, bool | int | str] = {
-        "meilisearch_enabled": True,
-        "postgres_enabled": False,
-        "redis_enabled": False,
-        "minio_enabled": False,
-    }
+    tf_start = time.monotonic()
+    tf_vars = terraform_vars(
+        cloud_config,
+        meilisearch_enabled=True,
+        postgres_enabled=False,
+        redis_enabled=False,
+        minio_enabled=False,
+    )
 
     if infra_config:
         tf_vars["meilisearch_cpu"] = infra_config.get("cpu", 4)
@@ -445,15 +638,14 @@ def ensure_infra(
         tf_vars["meilisearch_disk_type"] = infra_config.get("disk_type", "fast")
 
     ret_code, stdout, stderr = tf.apply(skip_plan=True, var=tf_vars)
-    tf_elapsed = int(time.time() - tf_start)
+    tf_elapsed = int(time.monotonic() - tf_start)
 
     if ret_code != 0:
         raise RuntimeError(f"Failed to create infrastructure: {stderr}")
 
     print(f"  Infrastructure created in {tf_elapsed}s")
 
-    meili_ip = get_tf_output(tf, "meilisearch_vm_ip")
-    benchmark_ip = get_tf_output(tf, "benchmark_vm_ip")
+    meili_ip, benchmark_ip = get_tf_outputs(tf, "meilisearch_vm_ip", "benchmark_vm_ip")
 
     if not meili_ip:
         raise RuntimeError("Meilisearch VM created but no IP returned")
@@ -463,14 +655,53 @@ def ensure_infra(
     print(f"  Meilisearch VM: {meili_ip}")
     print(f"  Benchmark VM: {benchmark_ip}")
 
-    # Wait for VMs
-    wait_for_vm_ready(benchmark_ip)
-    wait_for_vm_ready(meili_ip, jump_host=benchmark_ip)
-    wait_for_meilisearch_ready(meili_ip, jump_host=benchmark_ip)
+    # Wait for both VMs concurrently, then generate the dataset on the
+    # benchmark VM while Meilisearch finishes starting up
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        benchmark_ready = pool.submit(wait_for_vm_ready, benchmark_ip)
+        meili_vm_ready = pool.submit(
+            wait_for_vm_ready, meili_ip, jump_host=benchmark_ip
+        )
+        benchmark_ready.result()
+        install_scripts(benchmark_ip)
+        dataset_ready = pool.submit(ensure_dataset, benchmark_ip)
+        meili_vm_ready.result()
+        wait_for_meilisearch_ready(meili_ip, jump_host=benchmark_ip)
+        dataset_ready.result()
 
     return benchmark_ip, meili_ip
 
 
+def get_current_infra(cloud_config: CloudConfig) -> dict | None:
+    """Spec of the Meilisearch VM in Terraform state, in infra_config form."""
+    tf = get_terraform(cloud_config.terraform_dir)
+    try:
+        ret, out, _ = tf.output_cmd("meilisearch_config", json=IsFlagged)
+        spec = json.loads(out) if ret == 0 and out else None
+    except ValueError:
+        return None
+    if not spec or spec.get("disk_gb") != DISK_SIZE_GB:
+        return None
+    return {
+        "cpu": spec.get("cpu"),
+        "ram_gb": spec.get("ram_gb"),
+        "disk_type": spec.get("disk_type"),
+    }
+
+
+def delete_index(benchmark_ip: str, meili_ip: str) -> None:
+    """Delete the products index so the next upload indexes from scratch.
+
+    Deletion is an enqueued task; later index tasks run after it, so there is
+    nothing to wait for here.
+    """
+    delete_cmd = f"""
+curl -sf -X DELETE 'http://{meili_ip}:7700/indexes/products' \\
+  -H 'Authorization: Bearer {MASTER_KEY}'
+"""
+    run_ssh_command(benchmark_ip, delete_cmd, timeout=30)
+
+
 def reconfigure_meilisearch(
     meili_ip: str, config: dict, jump_host: str | None = None
 ) -> bool:
@@ -498,8 +729,12 @@ MEILI_MAX_INDEXING_THREADS={max_threads if max_threads > 0 else "auto"}
         print(f"  Failed to update config: {output}")
         return False
 
-    # Restart Meilisearch
-    restart_cmd = "systemctl restart meilisearch && sleep 3"
+    # Restart Meilisearch and poll its health endpoint instead of sleeping
+    restart_cmd = (
+        "systemctl restart meilisearch && "
+        "timeout 60 sh -c 'until curl -sf http://localhost:7700/health"
+        " >/dev/null; do sleep 0.5; done'"
+    )
     code, output = run_ssh_command(
         meili_ip, restart_cmd, timeout=60, jump_host=jump_host
     )
@@ -516,31 +751,35 @@ def results_file() -> Path:
     return RESULTS_DIR / "results.json"
 
 
-def config_to_key(infra: dict, meili_config: dict, cloud: str) -> str:
-    """Convert config dicts to a hashable key for deduplication."""
-    return json.dumps(
-        {"cloud": cloud, "infra": infra, "meili": meili_config}, sort_keys=True
-    )
+ConfigKey = tuple[str, tuple[tuple[str, Any], ...], tuple[tuple[str, Any], ...]]
+
+
+def config_to_key(infra: dict, meili_config: dict, cloud: str) -> ConfigKey:
+    """Convert config dicts to a hashable key for deduplication.
+
+    A tuple of sorted items: cheaper to build and hash than a JSON string.
+    """
+    return (cloud, tuple(sorted(infra.items())), tuple(sorted(meili_config.items())))
+
+
+def _is_reusable(result: dict) -> bool:
+    """Whether a stored result can stand in for re-running its config."""
+    return not result.get("error") and result.get("qps", 0) > 0
+
+
+# Successful results, consulted on every trial to skip re-benchmarking
+_RESULTS = ResultIndex(
+    results_file(),
+    key_fn=lambda r: config_to_key(
+        r.get("infra", {}), r.get("config", {}), r.get("cloud", "")
+    ),
+    is_success=_is_reusable,
+)
 
 
 def find_cached_result(infra: dict, meili_config: dict, cloud: str) -> dict | None:
     """Find a cached successful result for the given config."""
-    target_key = config_to_key(infra, meili_config, cloud)
-
-    rf = results_file()
-    if not rf.exists():
-        return None
-    for result in load_results(rf):
-        result_key = config_to_key(
-            result.get("infra", {}), result.get("config", {}), result.get("cloud", "")
-        )
-        if result_key == target_key:
-            if result.get("error"):
-                continue  # Skip errored, try next
-            if result.get("qps", 0) <= 0:
-                continue  # Skip failed, try next
-            return result
-    return None
+    return _RESULTS.get(config_to_key(infra, meili_config, cloud))
 
 
 def get_metric_value(result: dict, metric: str, cloud: str = "selectel") -> float:
@@ -571,9 +810,6 @@ def save_result(
     indexing_time: float = 0,
 ):
     """Save benchmark result."""
-    rf = results_file()
-    results = load_results(rf)
-
     timings_dict = None
     if result.timings:
         timings_dict = {
@@ -586,28 +822,22 @@ def save_result(
             "trial_total_s": result.timings.trial_total_s,
         }
 
-    results.append(
-        {
-            "trial": trial_num,
-            "timestamp": datetime.now().isoformat(),
-            "cloud": cloud,
-            "infra": infra_config,
-            "config": meili_config,
-            "qps": result.qps,
-            "p50_ms": result.p50_ms,
-            "p95_ms": result.p95_ms,
-            "p99_ms": result.p99_ms,
-            "error_rate": result.error_rate,
-            "indexing_time_s": indexing_time,
-            "error": result.error,
-            "timings": timings_dict,
-        }
-    )
-
-    save_results(results, rf)
-
-    # Auto-export markdown after each trial
-    export_results_md(cloud)
+    record = {
+        "trial": trial_num,
+        "timestamp": datetime.now().isoformat(),
+        "cloud": cloud,
+        "infra": infra_config,
+        "config": meili_config,
+        "qps": result.qps,
+        "p50_ms": result.p50_ms,
+        "p95_ms": result.p95_ms,
+        "p99_ms": result.p99_ms,
+        "error_rate": result.error_rate,
+        "indexing_time_s": indexing_time,
+        "error": result.error,
+        "timings": timings_dict,
+    }
+    _RESULTS.append(record)
 
 
 def config_summary(r: dict) -> str:
@@ -636,7 +866,11 @@ def format_results(cloud: str) -> dict | None:
 
     results_sorted = sorted(results, key=lambda x: x.get("qps", 0), reverse=True)
 
+    # Build rows and track the best ones in the same pass. Rows are in
+    # descending QPS order, so the first row is the best by QPS; strict
+    # comparisons keep the first row on ties.
     rows = []
+    best_p95_row = best_idx_row = best_eff_row = None
     for r in results_sorted:
         infra = r.get("infra", {})
         cfg = r.get("config", {})
@@ -644,37 +878,38 @@ def format_results(cloud: str) -> dict | None:
         cost = calculate_cost(infra, cloud)
         qps = r.get("qps", 0)
         eff = qps / cost if cost > 0 else 0
-        rows.append(
-            {
-                "cpu": infra.get("cpu", 0),
-                "ram": infra.get("ram_gb", 0),
-                "disk": infra.get("disk_type", "?"),
-                "mem_mb": cfg.get("max_indexing_memory_mb", 0),
-                "threads": cfg.get("max_indexing_threads", 0),
-                "qps": qps,
-                "p50": r.get("p50_ms", 0),
-                "p95": r.get("p95_ms", 0),
-                "p99": r.get("p99_ms", 0),
-                "idx_time": r.get("indexing_time_s", 0),
-                "cost": cost,
-                "eff": eff,
-                "_result": r,  # Keep reference for best calculation
-            }
-        )
-
-    # Find best results - use rows for efficiency (calculated on-the-fly)
-    best_qps_row = max(rows, key=lambda x: x.get("qps", 0))
-    best_p95_row = min(
-        [row for row in rows if row.get("p95", float("inf")) > 0],
-        key=lambda x: x.get("p95", float("inf")),
-        default=best_qps_row,
-    )
-    best_idx_row = min(
-        [row for row in rows if row.get("idx_time", 0) > 0],
-        key=lambda x: x.get("idx_time", float("inf")),
-        default=best_qps_row,
-    )
-    best_eff_row = max(rows, key=lambda x: x.get("eff", 0))
+        row = {
+            "cpu": infra.get("cpu", 0),
+            "ram": infra.get("ram_gb", 0),
+            "disk": infra.get("disk_type", "?"),
+            "mem_mb": cfg.get("max_indexing_memory_mb", 0),
+            "threads": cfg.get("max_indexing_threads", 0),
+            "qps": qps,
+            "p50": r.get("p50_ms", 0),
+            "p95": r.get("p95_ms", 0),
+            "p99": r.get("p99_ms", 0),
+            "idx_time": r.get("indexing_time_s", 0),
+            "cost": cost,
+            "eff": eff,
+            "_result": r,  # Keep reference for best calculation
+        }
+        rows.append(row)
+
+        if row["p95"] > 0 and (
+            best_p95_row is None or row["p95"] < best_p95_row["p95"]
+        ):
+            best_p95_row = row
+        if row["idx_time"] > 0 and (
+            best_idx_row is None or row["idx_time"] < best_idx_row["idx_time"]
+        ):
+            best_idx_row = row
+        if best_eff_row is None or eff > best_eff_row["eff"]:
+            best_eff_row = row
+
+    best_qps_row = rows[0]
+    best_p95_row = best_p95_row or best_qps_row
+    best_idx_row = best_idx_row or best_qps_row
+    best_eff_row = best_eff_row or best_qps_row
 
     return {
         "cloud": cloud,
@@ -792,7 +1027,7 @@ def export_results_md(cloud: str, output_path: Path | None = None) -> None:
         ]
     )
 
-    output_path.write_text("\n".join(lines))
+    write_text_atomic(output_path, "\n".join(lines))
     print(f"Results exported to {output_path}")
 
 
@@ -946,7 +1181,7 @@ def objective_infra(
     print(f"\n{'=' * 60}")
     print(f"Trial {trial.number} [infra]: {infra_config} @ {cost:.0f} ₽/mo")
     print(f"{'=' * 60}")
-    trial_start = time.time()
+    trial_start = time.monotonic()
     timings = TrialTimings()
 
     # Check cache - return cached value so Optuna learns from it
@@ -956,43 +1191,52 @@ def objective_infra(
         print(f"  Using cached result: {cached_value:.2f} ({metric})")
         return cached_value
 
-    # Destroy and recreate
-    print("  Destroying previous VM...")
-    destroy_all(cloud_config.terraform_dir, cloud_config.name)
-    time.sleep(5)
+    # Keep the running VM if it already has this spec (e.g. the previous
+    # trial on it was pruned); otherwise destroy and recreate
+    reuse_vm = get_current_infra(cloud_config) == infra_config
+    if reuse_vm:
+        print("  Reusing running VM with the same spec")
+    else:
+        print("  Destroying previous VM...")
+        destroy_all(
+            cloud_config.terraform_dir, cloud_config.name, terraform_vars(cloud_config)
+        )
+        time.sleep(5)
 
     try:
-        infra_start = time.time()
+        infra_start = time.monotonic()
         benchmark_ip, meili_ip = ensure_infra(cloud_config, infra_config)
-        timings.terraform_s = time.time() - infra_start
+        timings.terraform_s = time.monotonic() - infra_start
     except Exception as e:
         print(f"  Failed to create infrastructure: {e}")
         raise optuna.TrialPruned("Infrastructure creation failed")
 
+    if reuse_vm:
+        # Measure indexing from an empty index, as on a fresh VM
+        delete_index(benchmark_ip, meili_ip)
+
     # Index dataset
-    index_start = time.time()
-    indexing_time = upload_and_index_dataset(benchmark_ip, meili_ip)
-    timings.indexing_s = time.time() - index_start
+    index_start = time.monotonic()
+    indexing_time = upload_and_index_dataset(
+        benchmark_ip, meili_ip, on_progress=indexing_pruner(trial, metric)
+    )
+    timings.indexing_s = time.monotonic() - index_start
     if indexing_time < 0:
         raise optuna.TrialPruned("Indexing failed")
 
     # Run benchmark with fixed VUs for fair comparison across configs
-    benchmark_start = time.time()
+    benchmark_start = time.monotonic()
     vus = 128  # Fixed VUs to saturate all configs equally
-    result = run_k6_benchmark(benchmark_ip, meili_ip, vus=vus, duration=60)
-    timings.benchmark_s = time.time() - benchmark_start
+    result = run_pruned_benchmark(trial, benchmark_ip, meili_ip, metric, cost, vus)
+    timings.benchmark_s = time.monotonic() - benchmark_start
 
     if result.error:
         print(f"  Benchmark failed: {result.error}")
         raise optuna.TrialPruned(result.error)
 
-    timings.trial_total_s = time.time() - trial_start
+    timings.trial_total_s = time.monotonic() - trial_start
     result.timings = timings
 
-    if result.error:
-        print(f"  Benchmark failed: {result.error}")
-        raise optuna.TrialPruned(result.error)
-
     eff = result.qps / cost if cost > 0 else 0
     print(
         f"  Result: {result.qps:.1f} QPS, p95={result.p95_ms:.1f}ms, efficiency={eff:.2f} QPS/₽"
@@ -1013,16 +1257,21 @@ def objective_infra(
     )
 
     # Return metric (minimize p95/indexing_time, maximize qps/cost_efficiency)
-    if metric == "p95_ms":
-        return result.p95_ms
-    elif metric == "qps":
-        return result.qps
-    elif metric == "cost_efficiency":
-        return result.qps / cost if cost > 0 else 0
-    elif metric == "indexing_time":
-        return indexing_time
-    else:
-        return result.qps
+    return benchmark_metric_value(result, metric, cost, indexing_time)
+
+
+def objective_infra_on_worker(
+    trial: optuna.Trial,
+    cloud: str,
+    workers: queue.Queue[CloudConfig],
+    metric: str = "p95_ms",
+) -> float:
+    """Run objective_infra on a free worker's Terraform workspace."""
+    cloud_config = workers.get()
+    try:
+        return objective_infra(trial, cloud, cloud_config, metric)
+    finally:
+        workers.put(cloud_config)
 
 
 def objective_config(
@@ -1050,7 +1299,7 @@ def objective_config(
     print(f"\n{'=' * 60}")
     print(f"Trial {trial.number} [config]: {config} @ {cost:.0f} ₽/mo")
     print(f"{'=' * 60}")
-    trial_start = time.time()
+    trial_start = time.monotonic()
     timings = TrialTimings()
 
     # Check cache - return cached value so Optuna learns from it
@@ -1065,31 +1314,27 @@ def objective_config(
         raise optuna.TrialPruned("Meilisearch config failed")
 
     # Re-index to test indexing performance with new settings
-    # First delete existing index
-    delete_cmd = f"""
-curl -sf -X DELETE 'http://{meili_ip}:7700/indexes/products' \\
-  -H 'Authorization: Bearer {MASTER_KEY}'
-"""
-    run_ssh_command(benchmark_ip, delete_cmd, timeout=30)
-    time.sleep(2)
+    delete_index(benchmark_ip, meili_ip)
 
-    index_start = time.time()
-    indexing_time = upload_and_index_dataset(benchmark_ip, meili_ip)
-    timings.indexing_s = time.time() - index_start
+    index_start = time.monotonic()
+    indexing_time = upload_and_index_dataset(
+        benchmark_ip, meili_ip, on_progress=indexing_pruner(trial, metric)
+    )
+    timings.indexing_s = time.monotonic() - index_start
     if indexing_time < 0:
         raise optuna.TrialPruned("Indexing failed")
 
     # Run benchmark with fixed VUs for fair comparison across configs
-    benchmark_start = time.time()
+    benchmark_start = time.monotonic()
     vus = 128  # Fixed VUs to saturate all configs equally
-    result = run_k6_benchmark(benchmark_ip, meili_ip, vus=vus, duration=60)
-    timings.benchmark_s = time.time() - benchmark_start
+    result = run_pruned_benchmark(trial, benchmark_ip, meili_ip, metric, cost, vus)
+    timings.benchmark_s = time.monotonic() - benchmark_start
 
     if result.error:
         print(f"  Benchmark failed: {result.error}")
         raise optuna.TrialPruned(result.error)
 
-    timings.trial_total_s = time.time() - trial_start
+    timings.trial_total_s = time.monotonic() - trial_start
     result.timings = timings
 
     eff = result.qps / cost if cost > 0 else 0
@@ -1110,17 +1355,7 @@ curl -sf -X DELETE 'http://{meili_ip}:7700/indexes/products' \\
         indexing_time,
     )
 
-    if metric == "p95_ms":
-        return result.p95_ms
-    elif metric == "qps":
-        return result.qps
-    elif metric == "cost_efficiency":
-        cost = calculate_cost(infra_config, cloud)
-        return result.qps / cost if cost > 0 else 0
-    elif metric == "indexing_time":
-        return indexing_time
-    else:
-        return result.qps
+    return benchmark_metric_value(result, metric, cost, indexing_time)
 
 
 def main():
@@ -1150,6 +1385,19 @@ def main():
     parser.add_argument(
         "--ram", type=int, default=8, help="Fixed RAM GB for config mode"
     )
+    parser.add_argument(
+        "--parallel",
+        "-j",
+        type=int,
+        default=1,
+        help="Infra trials to run concurrently, each on its own VMs (infra/full modes)",
+    )
+    parser.add_argument(
+        "--startup-trials",
+        type=int,
+        default=None,
+        help="Random trials before TPE starts modelling (default: max(5, trials/4))",
+    )
     parser.add_argument(
         "--no-destroy",
         action="store_true",
@@ -1161,6 +1409,7 @@ def main():
 
     args = parser.parse_args()
     cloud_config = get_cloud_config(args.cloud)
+    parallel = max(1, args.parallel)
 
     # Determine direction
     direction = "minimize" if args.metric == "p95_ms" else "maximize"
@@ -1176,14 +1425,27 @@ def main():
         export_results_md(args.cloud)
         return
 
+    storage = open_study_storage(STUDY_JOURNAL, STUDY_DB)
+    worker_configs = [cloud_config]
     try:
+        if args.mode in ("infra", "full"):
+            worker_configs = make_worker_configs(cloud_config, parallel)
+        workers: queue.Queue[CloudConfig] = queue.Queue()
+        for worker_config in worker_configs:
+            workers.put(worker_config)
+
         if args.mode == "infra":
             study = optuna.create_study(
                 study_name=f"meilisearch-{args.cloud}-infra-{args.metric}",
-                storage=f"sqlite:///{STUDY_DB}",
+                storage=storage,
                 load_if_exists=True,
                 direction=direction,
-                sampler=TPESampler(seed=42),
+                sampler=make_sampler(
+                    args.trials,
+                    constant_liar=parallel > 1,
+                    n_startup_trials=args.startup_trials,
+                ),
+                pruner=make_pruner(),
             )
 
             # Pre-load historical results so Optuna can learn from them
@@ -1192,10 +1454,12 @@ def main():
                 print(f"Loaded {n_loaded} historical trials into Optuna")
 
             study.optimize(
-                lambda trial: objective_infra(
-                    trial, args.cloud, cloud_config, args.metric
+                lambda trial: objective_infra_on_worker(
+                    trial, args.cloud, workers, args.metric
                 ),
                 n_trials=args.trials,
+                gc_after_trial=True,
+                n_jobs=parallel,
                 catch=(optuna.TrialPruned,),
             )
 
@@ -1206,17 +1470,17 @@ def main():
                 "disk_type": "fast",
             }
 
+            # No initial indexing: every config trial deletes and rebuilds the
+            # index itself, since the tuned settings only affect indexing
             benchmark_ip, meili_ip = ensure_infra(cloud_config, infra_config)
 
-            # Initial indexing
-            upload_and_index_dataset(benchmark_ip, meili_ip)
-
             study = optuna.create_study(
                 study_name=f"meilisearch-{args.cloud}-config-{args.metric}",
-                storage=f"sqlite:///{STUDY_DB}",
+                storage=storage,
                 load_if_exists=True,
                 direction=direction,
-                sampler=TPESampler(seed=42),
+                sampler=make_sampler(args.trials, n_startup_trials=args.startup_trials),
+                pruner=make_pruner(),
             )
 
             # Pre-load historical results so Optuna can learn from them
@@ -1235,6 +1499,7 @@ def main():
                     args.metric,
                 ),
                 n_trials=args.trials,
+                gc_after_trial=True,
                 catch=(optuna.TrialPruned,),
             )
 
@@ -1247,10 +1512,15 @@ def main():
 
             study_infra = optuna.create_study(
                 study_name=f"meilisearch-{args.cloud}-full-infra-{args.metric}",
-                storage=f"sqlite:///{STUDY_DB}",
+                storage=storage,
                 load_if_exists=True,
                 direction=direction,
-                sampler=TPESampler(seed=42),
+                sampler=make_sampler(
+                    infra_trials,
+                    constant_liar=parallel > 1,
+                    n_startup_trials=args.startup_trials,
+                ),
+                pruner=make_pruner(),
             )
 
             # Pre-load historical results so Optuna can learn from them
@@ -1261,10 +1531,12 @@ def main():
                 print(f"Loaded {n_loaded} historical trials into Optuna")
 
             study_infra.optimize(
-                lambda trial: objective_infra(
-                    trial, args.cloud, cloud_config, args.metric
+                lambda trial: objective_infra_on_worker(
+                    trial, args.cloud, workers, args.metric
                 ),
                 n_trials=infra_trials,
+                gc_after_trial=True,
+                n_jobs=parallel,
                 catch=(optuna.TrialPruned,),
             )
 
@@ -1285,16 +1557,19 @@ def main():
             )
             print(f"Best infra: {infra_config}")
 
-            destroy_all(cloud_config.terraform_dir, cloud_config.name)
+            for worker_config in worker_configs:
+                destroy_workspace(worker_config)
             benchmark_ip, meili_ip = ensure_infra(cloud_config, infra_config)
-            upload_and_index_dataset(benchmark_ip, meili_ip)
 
             study_config = optuna.create_study(
                 study_name=f"meilisearch-{args.cloud}-full-config-{args.metric}",
-                storage=f"sqlite:///{STUDY_DB}",
+                storage=storage,
                 load_if_exists=True,
                 direction=direction,
-                sampler=TPESampler(seed=42),
+                sampler=make_sampler(
+                    config_trials, n_startup_trials=args.startup_trials
+                ),
+                pruner=make_pruner(),
             )
 
             # Pre-load historical results so Optuna can learn from them
@@ -1304,6 +1579,10 @@ def main():
             if n_loaded:
                 print(f"Loaded {n_loaded} historical trials into Optuna")
 
+            # Start the config search near settings that suit the chosen host
+            for params in warm_start_configs(infra_config):
+                study_config.enqueue_trial(params, skip_if_exists=True)
+
             study_config.optimize(
                 lambda trial: objective_config(
                     trial,
@@ -1315,6 +1594,7 @@ def main():
                     args.metric,
                 ),
                 n_trials=config_trials,
+                gc_after_trial=True,
                 catch=(optuna.TrialPruned,),
             )
 
@@ -1323,14 +1603,17 @@ def main():
             print(f"Config: {study_config.best_params}")
             print(f"Best {args.metric}: {study_config.best_value}")
 
-        # Auto-export results to markdown
-        export_results_md(args.cloud)
-        print(f"\nResults exported to RESULTS_{args.cloud.upper()}.md")
-
     finally:
+        # Export even after Ctrl-C or a failure, without masking its exception
+        try:
+            export_results_md(args.cloud)
+            print(f"\nResults exported to RESULTS_{args.cloud.upper()}.md")
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            print(f"\nWarning: Failed to export results: {e}")
         if not args.no_destroy:
             print("\nCleaning up...")
-            destroy_all(cloud_config.terraform_dir, cloud_config.name)
+            for worker_config in worker_configs:
+                destroy_workspace(worker_config)
 
 
 if __name__ == "__main__":
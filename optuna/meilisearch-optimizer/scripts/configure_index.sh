@@ -0,0 +1,16 @@
+#!/bin/sh
+# Create the products index and apply its settings.
+# Usage: configure_index.sh <meili-url> <master-key>
+curl -sf -X POST "$1/indexes" \
+  -H "Authorization: Bearer $2" \
+  -H 'Content-Type: application/json' \
+  --data '{"uid": "products", "primaryKey": "id"}'
+echo
+curl -sf -X PATCH "$1/indexes/products/settings" \
+  -H "Authorization: Bearer $2" \
+  -H 'Content-Type: application/json' \
+  --data '{
+    "searchableAttributes": ["title", "description", "brand"],
+    "filterableAttributes": ["category", "brand", "price", "rating", "in_stock"],
+    "sortableAttributes": ["price", "rating"]
+  }'
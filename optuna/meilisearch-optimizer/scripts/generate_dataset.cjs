@@ -0,0 +1,52 @@
+// Generate the benchmark products as NDJSON into products.ndjson.tmp in the
+// current directory. Usage: node generate_dataset.cjs <count>
+const fs = require('fs');
+
+// Seeded RNG (Mulberry32)
+let seed = 42;
+function rng() {
+  seed = (seed + 0x6d2b79f5) | 0;
+  let t = seed;
+  t = Math.imul(t ^ (t >>> 15), t | 1);
+  t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+  return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+}
+
+const pick = arr => arr[Math.floor(rng() * arr.length)];
+
+const CATEGORIES = ["Laptops", "Smartphones", "Tablets", "Headphones", "Cameras", "TVs", "Gaming", "Wearables", "Audio", "Accessories"];
+const BRANDS = ["Apple", "Samsung", "Sony", "LG", "Dell", "HP", "Lenovo", "Asus", "Acer", "Microsoft", "Google", "Bose", "JBL", "Canon", "Nikon"];
+const ADJECTIVES = ["Pro", "Ultra", "Max", "Plus", "Lite", "Mini", "Elite", "Premium", "Advanced", "Essential"];
+const PRICE_BASE = {Laptops: 1000, Smartphones: 500, Tablets: 400, Headphones: 100, Cameras: 800, TVs: 600, Gaming: 200, Wearables: 200, Audio: 150, Accessories: 30};
+
+// Serialize each product straight into an NDJSON line (same bytes as
+// JSON.stringify: keys are fixed and no value needs escaping)
+function genLine(i) {
+  const cat = pick(CATEGORIES);
+  const brand = pick(BRANDS);
+  const adj = pick(ADJECTIVES);
+  const singular = cat.endsWith('s') ? cat.slice(0, -1) : cat;
+  const price = Math.round(PRICE_BASE[cat] * (0.5 + rng() * 2) * 100) / 100;
+  const rating = Math.round((3 + rng() * 2) * 10) / 10;
+  const inStock = rng() > 0.1;
+  return `{"id":${i},"title":"${brand} ${adj} ${singular} ${i % 20}",` +
+    `"description":"High-quality ${cat.toLowerCase()} from ${brand} with ${adj.toLowerCase()} features",` +
+    `"brand":"${brand}","category":"${cat}","price":${price},"rating":${rating},"in_stock":${inStock}}\n`;
+}
+
+// Write in ~1 MiB chunks instead of one stream.write per product
+const FLUSH_CHARS = 1 << 20;
+const fd = fs.openSync('products.ndjson.tmp', 'w');
+const total = parseInt(process.argv[2], 10);
+let buf = '';
+for (let i = 1; i <= total; i++) {
+  buf += genLine(i);
+  if (buf.length >= FLUSH_CHARS) {
+    fs.writeSync(fd, buf);
+    buf = '';
+  }
+  if (i % 100000 === 0) console.log(`Generated ${i} products`);
+}
+fs.writeSync(fd, buf);
+fs.closeSync(fd);
+console.log(`Done generating ${total} products`);
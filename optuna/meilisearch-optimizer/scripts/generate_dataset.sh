@@ -0,0 +1,12 @@
+#!/bin/sh
+# Generate the dataset and its gzipped upload batches.
+# Usage: generate_dataset.sh <cache-dir> <count>
+set -e
+scripts_dir=$(cd "$(dirname "$0")" && pwd)
+mkdir -p "$1"
+cd "$1"
+node "$scripts_dir/generate_dataset.cjs" "$2"
+rm -f batch_*
+split -l 50000 products.ndjson.tmp batch_
+gzip -1 batch_*
+mv products.ndjson.tmp products.ndjson
@@ -0,0 +1,7 @@
+#!/bin/sh
+# Print how many of the given tasks have finished (succeeded, failed or
+# canceled), for extrapolating the total indexing time.
+# Usage: index_progress.sh <meili-url> <master-key> <uid,uid,...>
+curl -sf "$1/tasks?uids=$3&statuses=succeeded,failed,canceled&limit=1" \
+  -H "Authorization: Bearer $2" \
+  | grep -o '"total":[0-9]*' | cut -d: -f2
@@ -0,0 +1,8 @@
+#!/bin/sh
+# Print the search_latency_ms and iterations metrics of the k6 run started by
+# start_k6.sh, read from its REST API, one JSON document per line ({} if k6
+# isn't serving yet).
+for metric in search_latency_ms iterations; do
+  curl -sf "http://127.0.0.1:6565/v1/metrics/$metric" || printf '{}'
+  echo
+done
@@ -0,0 +1,18 @@
+#!/bin/sh
+# Start benchmark.js under k6 in the background, with its REST API on
+# 127.0.0.1:6565 for reading metrics mid-run (see k6_progress.sh). The summary
+# goes to /tmp/k6_results.json and the exit status to /tmp/k6_exit.
+# Usage: start_k6.sh <meili-url> <master-key> <vus> <duration-s>
+scripts_dir=$(cd "$(dirname "$0")" && pwd)
+rm -f /tmp/k6_results.json /tmp/k6_exit
+(
+  K6_SUMMARY_TREND_STATS="avg,min,med,max,p(90),p(95),p(99)" k6 run "$scripts_dir/benchmark.js" \
+    -e MEILI_URL="$1" \
+    -e MEILI_KEY="$2" \
+    -e VUS="$3" \
+    -e DURATION="$4s" \
+    --address 127.0.0.1:6565 \
+    --summary-export=/tmp/k6_results.json \
+    > /tmp/k6_output.log 2>&1
+  echo $? > /tmp/k6_exit
+) < /dev/null > /dev/null 2>&1 &
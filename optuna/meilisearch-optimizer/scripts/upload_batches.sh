@@ -0,0 +1,14 @@
+#!/bin/sh
+# Upload the gzipped batches over a single keep-alive connection: one curl
+# process reads a config with one request block per batch file. Prints one
+# task JSON per line.
+# Usage: upload_batches.sh <meili-url> <master-key> <cache-dir>
+sep=""
+for f in "$3"/batch_*.gz; do
+  [ -n "$sep" ] && echo "$sep"
+  sep="next"
+  printf 'url = "%s/indexes/products/documents"\nrequest = "POST"\n' "$1"
+  printf 'header = "Authorization: Bearer %s"\nheader = "Content-Type: application/x-ndjson"\n' "$2"
+  printf 'header = "Content-Encoding: gzip"\n'
+  printf 'data-binary = "@%s"\nwrite-out = "\\n"\n' "$f"
+done | curl -sf -K -
@@ -0,0 +1,23 @@
+#!/bin/sh
+# Wait for the last task (tasks run in order), polling with exponential
+# backoff from 0.25s up to 8s, then check none of the tasks failed.
+# Usage: wait_for_tasks.sh <meili-url> <master-key> <uid,uid,...>
+last=${3##*,}
+delay=0.25
+while true; do
+  status=$(curl -sf "$1/tasks/$last" -H "Authorization: Bearer $2" \
+    | grep -o '"status":"[a-z]*"' | head -1 | cut -d'"' -f4)
+  case "$status" in
+    succeeded) break ;;
+    failed|canceled) echo "Last indexing task $status"; exit 1 ;;
+  esac
+  sleep $delay
+  delay=$(awk "BEGIN { d = $delay * 2; print (d > 8 ? 8 : d) }")
+done
+failed=$(curl -sf "$1/tasks?uids=$3&statuses=failed,canceled" -H "Authorization: Bearer $2" \
+  | grep -o '"total":[0-9]*' | cut -d: -f2)
+if [ "$failed" != "0" ]; then
+  echo "Failed indexing tasks: $failed"
+  exit 1
+fi
+echo "Indexing complete"
@@ -0,0 +1,10 @@
+#!/bin/sh
+# Wait for k6 started by start_k6.sh, then print the summary JSON (or the end
+# of k6's own output if it failed).
+while [ ! -s /tmp/k6_exit ]; do sleep 1; done
+status=$(cat /tmp/k6_exit)
+if [ "$status" -ne 0 ]; then
+  tail -c 2000 /tmp/k6_output.log
+  exit "$status"
+fi
+cat /tmp/k6_results.json
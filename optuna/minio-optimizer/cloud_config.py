@@ -24,6 +24,7 @@ class CloudConfig:
     cpu_cost: float
     ram_cost: float
     disk_cost_multipliers: dict[str, float]
+    environment_name: str | None = None  # Resource name suffix for parallel workers
 
 
 # Base path for terraform configs
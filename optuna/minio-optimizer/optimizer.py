@@ -15,37 +15,50 @@ Usage:
 
 import argparse
 import json
+import queue
 import re
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 import optuna
 from optuna.samplers import TPESampler
+from python_terraform import IsFlagged
 
 # Add parent dir to path for common imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from common import (
+    ResultIndex,
+    cached_metric_value,
     clear_known_hosts_on_vm,
     clear_terraform_state,
-    destroy_all,
+    destroy_workspace,
     get_terraform,
     get_tf_output,
     is_stale_state_error,
     load_results,
+    make_worker_configs,
+    open_study_storage,
     run_ssh_command,
-    save_results,
+    search_distributions,
+    seed_study_from_results,
+    terraform_vars,
+    trial_params,
     validate_vm_exists,
     wait_for_vm_ready,
+    write_text_atomic,
 )
-
 from cloud_config import CloudConfig, get_cloud_config, get_config_space
-from pricing import DiskConfig, calculate_vm_cost, filter_valid_ram
+from pricing import DiskConfig, calculate_vm_cost
 
 RESULTS_DIR = Path(__file__).parent
+STUDY_JOURNAL = RESULTS_DIR / "study.log"
+# Pre-journal SQLite study, migrated into STUDY_JOURNAL on first run
 STUDY_DB = RESULTS_DIR / "study.db"
 
 # Available optimization metrics
@@ -214,7 +227,7 @@ def export_results_md(cloud: str, output_path: Path | None = None) -> None:
         ]
     )
 
-    output_path.write_text("\n".join(lines))
+    write_text_atomic(output_path, "\n".join(lines))
     print(f"Results exported to {output_path}")
 
 
@@ -286,46 +299,72 @@ class BenchmarkResult:
     timings: TrialTimings | None = None
 
 
-def config_to_key(config: dict, cloud: str) -> str:
-    """Convert config dict to a hashable key for deduplication."""
-    return json.dumps(
-        {
-            "cloud": cloud,
-            "nodes": config["nodes"],
-            "cpu_per_node": config["cpu_per_node"],
-            "ram_per_node": config["ram_per_node"],
-            "drives_per_node": config["drives_per_node"],
-            "drive_size_gb": config["drive_size_gb"],
-            "drive_type": config["drive_type"],
-        },
-        sort_keys=True,
+ConfigKey = tuple[str, int, int, int, int, int, str]
+
+
+def config_to_key(config: dict, cloud: str) -> ConfigKey:
+    """Convert config dict to a hashable key for deduplication.
+
+    A plain tuple: cheaper to build and hash than a JSON string.
+    """
+    return (
+        cloud,
+        config["nodes"],
+        config["cpu_per_node"],
+        config["ram_per_node"],
+        config["drives_per_node"],
+        config["drive_size_gb"],
+        config["drive_type"],
     )
 
 
-def find_cached_result(config: dict, cloud: str) -> dict | None:
-    """Find a cached successful result for the given config.
+def _is_reusable(result: dict) -> bool:
+    """Whether a stored result can stand in for re-running its config.
 
-    Returns None if:
-    - No cached result exists
-    - Cached result has error (failed trial)
-    - Cached result has 0 throughput (benchmark failed)
-    - Cached result is missing required metrics (system_baseline, timings)
+    Skips failed results (they should be retried), results with 0 throughput
+    (benchmark failed) and results missing required metrics
+    (system_baseline, timings).
     """
-    target_key = config_to_key(config, cloud)
-    for result in load_results(results_file()):
-        if config_to_key(result["config"], result.get("cloud", "")) == target_key:
-            # Skip failed results - they should be retried
-            if result.get("error"):
-                return None
-            if result.get("total_mib_s", 0) <= 0:
-                return None
-            # Skip results missing required metrics
-            if not result.get("system_baseline"):
-                return None
-            if not result.get("timings"):
-                return None
-            return result
-    return None
+    return (
+        not result.get("error")
+        and result.get("total_mib_s", 0) > 0
+        and bool(result.get("system_baseline"))
+        and bool(result.get("timings"))
+    )
+
+
+# Reusable results, consulted on every trial to skip re-benchmarking
+_RESULTS = ResultIndex(
+    results_file(),
+    key_fn=lambda r: config_to_key(r["config"], r.get("cloud", "")),
+    is_success=_is_reusable,
+)
+
+
+def find_cached_result(config: dict, cloud: str) -> dict | None:
+    """Find a cached successful result for the given config."""
+    return _RESULTS.get(config_to_key(config, cloud))
+
+
+# Trial parameters taken from the config space as-is (RAM is per CPU count)
+SEARCH_PARAMS = (
+    "nodes",
+    "cpu_per_node",
+    "drives_per_node",
+    "drive_size_gb",
+    "drive_type",
+)
+
+
+def stored_metric_value(result: dict, cloud: str, metric: str) -> float:
+    """Objective value of a stored result."""
+    return cached_metric_value(
+        result,
+        metric,
+        "total_mib_s",
+        lambda config: calculate_cost(config, cloud),
+        get_metric_value,
+    )
 
 
 def wait_for_minio_ready(
@@ -333,52 +372,34 @@ def wait_for_minio_ready(
 ) -> bool:
     """Wait for MinIO to be ready (cloud-init complete and service responding).
 
-    Uses SSH agent forwarding to check MinIO node via benchmark VM.
+    Uses SSH agent forwarding to check MinIO node via benchmark VM. Polls with
+    exponential backoff (2s up to 10s), so a node that comes up quickly is
+    noticed within seconds.
     """
     # Clear stale known_hosts to avoid host key change errors
     clear_known_hosts_on_vm(vm_ip)
 
     print(f"  Waiting for MinIO at {minio_ip} to be ready...")
 
-    start = time.time()
-    ssh_ready = False
-
-    while time.time() - start < timeout:
-        elapsed = time.time() - start
+    # Fails until SSH is reachable, cloud-init is done and MinIO is healthy
+    check_cmd = (
+        f"ssh -A -o StrictHostKeyChecking=no -o ConnectTimeout=5 root@{minio_ip} "
+        f"'test -f /root/minio-ready && curl -sf http://localhost:9000/minio/health/ready'"
+    )
+    start = time.monotonic()
+    delay = 2.0
+    while time.monotonic() - start < timeout:
+        elapsed = time.monotonic() - start
         try:
-            if not ssh_ready:
-                # First, just check if SSH is reachable
-                ssh_cmd = (
-                    f"ssh -A -o StrictHostKeyChecking=no -o ConnectTimeout=5 root@{minio_ip} "
-                    f"'echo ok'"
-                )
-                code, _ = run_ssh_command(
-                    vm_ip, ssh_cmd, timeout=15, forward_agent=True
-                )
-                if code == 0:
-                    print(f"  SSH to MinIO node available ({elapsed:.0f}s)")
-                    ssh_ready = True
-                else:
-                    print(f"  Waiting for SSH ({elapsed:.0f}s)...")
-                    time.sleep(10)
-                    continue
-
-            # Check if cloud-init is complete and MinIO is healthy
-            check_cmd = (
-                f"ssh -A -o StrictHostKeyChecking=no -o ConnectTimeout=5 root@{minio_ip} "
-                f"'test -f /root/minio-ready && curl -sf http://localhost:9000/minio/health/ready'"
-            )
-            code, output = run_ssh_command(
-                vm_ip, check_cmd, timeout=20, forward_agent=True
-            )
+            code, _ = run_ssh_command(vm_ip, check_cmd, timeout=20, forward_agent=True)
             if code == 0:
                 print(f"  MinIO is ready! ({elapsed:.0f}s)")
                 return True
-            else:
-                print(f"  MinIO not ready yet ({elapsed:.0f}s)...")
+            print(f"  MinIO not ready yet ({elapsed:.0f}s)...")
         except Exception as e:
             print(f"  MinIO check failed ({elapsed:.0f}s): {e}")
-        time.sleep(10)
+        time.sleep(delay)
+        delay = min(delay * 1.5, 10.0)
 
     print(f"  Warning: MinIO not ready after {timeout}s, continuing anyway...")
     return False
@@ -424,7 +445,7 @@ def ensure_benchmark_vm(cloud_config: CloudConfig) -> str:
 
     # Create VM only (explicitly disable MinIO to avoid terraform.tfvars override)
     print("  Creating benchmark VM...")
-    tf_vars = {"minio_enabled": False}
+    tf_vars = terraform_vars(cloud_config, minio_enabled=False)
     ret_code, stdout, stderr = tf.apply(skip_plan=True, var=tf_vars)
 
     if ret_code != 0:
@@ -483,26 +504,40 @@ def deploy_minio(
         max_retries: Number of retries for transient errors
     """
     print(f"  Deploying MinIO on {cloud_config.name}: {config}")
-    start = time.time()
+    start = time.monotonic()
 
     tf = get_terraform(cloud_config.terraform_dir)
 
     # Build variables for terraform apply
-    tf_vars = {
-        "minio_enabled": True,
-        "minio_node_count": config["nodes"],
-        "minio_node_cpu": config["cpu_per_node"],
-        "minio_node_ram_gb": config["ram_per_node"],
-        "minio_drives_per_node": config["drives_per_node"],
-        "minio_drive_size_gb": config["drive_size_gb"],
-        "minio_drive_type": config["drive_type"],
-    }
+    tf_vars = terraform_vars(
+        cloud_config,
+        minio_enabled=True,
+        minio_node_count=config["nodes"],
+        minio_node_cpu=config["cpu_per_node"],
+        minio_node_ram_gb=config["ram_per_node"],
+        minio_drives_per_node=config["drives_per_node"],
+        minio_drive_size_gb=config["drive_size_gb"],
+        minio_drive_type=config["drive_type"],
+    )
 
-    # Apply with retries for transient errors
+    # Volumes, ports and instances are created concurrently; allow more than
+    # Terraform's default 10 at a time for larger clusters
+    parallelism = max(
+        10, min(30, config["nodes"] * config["drives_per_node"] + config["nodes"])
+    )
+
+    # Apply with retries for transient errors. The first attempt skips the
+    # state refresh (the previous trial just applied this state); retries
+    # refresh in case the state went stale.
     ret_code = 1
     stderr = ""
     for attempt in range(max_retries):
-        ret_code, stdout, stderr = tf.apply(skip_plan=True, var=tf_vars)
+        ret_code, stdout, stderr = tf.apply(
+            skip_plan=True,
+            var=tf_vars,
+            parallelism=parallelism,
+            refresh=attempt > 0,
+        )
 
         if ret_code == 0:
             break
@@ -525,50 +560,110 @@ def deploy_minio(
 
         # Unknown error
         print(f"  Terraform apply failed: {stderr}")
-        return False, time.time() - start
+        return False, time.monotonic() - start
 
     if ret_code != 0:
         print(f"  Terraform apply failed after {max_retries} retries: {stderr}")
-        return False, time.time() - start
+        return False, time.monotonic() - start
 
     # Wait for MinIO to be ready (cloud-init + service health check)
     if not wait_for_minio_ready(vm_ip):
         print("  Warning: MinIO may not be fully ready")
 
-    duration = time.time() - start
+    duration = time.monotonic() - start
     print(f"  MinIO deployed in {duration:.1f}s")
     return True, duration
 
 
+def get_deployed_config(cloud_config: CloudConfig) -> dict | None:
+    """Config of the MinIO cluster in Terraform state, or None if not deployed."""
+    tf = get_terraform(cloud_config.terraform_dir)
+    try:
+        ret, out, _ = tf.output_cmd("minio_cluster_spec", json=IsFlagged)
+        spec = json.loads(out) if ret == 0 and out else None
+    except ValueError:
+        return None
+    if not spec:
+        return None
+    return {
+        "nodes": spec.get("nodes"),
+        "cpu_per_node": spec.get("cpu_per_node"),
+        "ram_per_node": spec.get("ram_per_node_gb"),
+        "drives_per_node": spec.get("drives_per_node"),
+        "drive_size_gb": spec.get("drive_size_gb"),
+        "drive_type": spec.get("drive_type"),
+    }
+
+
+# Clouds where a CPU/RAM-only change resizes MinIO nodes in place. On
+# OpenStack (Selectel) it swaps the flavor; the instances keep their volumes,
+# ports and cloud-init.
+IN_PLACE_RESIZE_CLOUDS = {"selectel"}
+
+
+def can_resize_in_place(deployed: dict | None, config: dict, cloud: str) -> bool:
+    """Whether applying config over the deployed cluster only resizes nodes.
+
+    Node count and drive changes alter volumes or cloud-init, so they still
+    need a fresh cluster.
+    """
+    if cloud not in IN_PLACE_RESIZE_CLOUDS or deployed is None:
+        return False
+    return all(
+        deployed[key] == config[key]
+        for key in ("nodes", "drives_per_node", "drive_size_gb", "drive_type")
+    )
+
+
+def has_minio_resources(cloud_config: CloudConfig) -> bool:
+    """Whether Terraform state holds any MinIO resources (True if unsure)."""
+    tf = get_terraform(cloud_config.terraform_dir)
+    ret_code, stdout, _ = tf.cmd("state", "list")
+    if ret_code != 0:
+        return True
+    return any(".minio" in line for line in (stdout or "").splitlines())
+
+
 def destroy_minio(cloud_config: CloudConfig) -> tuple[bool, float]:
     """Destroy MinIO cluster but keep benchmark VM. Returns (success, duration_s)."""
     print(f"  Destroying MinIO on {cloud_config.name}...")
-    start = time.time()
+    start = time.monotonic()
 
     tf = get_terraform(cloud_config.terraform_dir)
 
-    # Apply with minio_enabled=false to destroy MinIO but keep VM
-    ret_code, stdout, stderr = tf.apply(skip_plan=True, var={"minio_enabled": False})
+    # Apply with minio_enabled=false to destroy MinIO but keep VM (no refresh:
+    # only resources in state are deleted, and a vanished one fails as stale)
+    ret_code, stdout, stderr = tf.apply(
+        skip_plan=True,
+        var=terraform_vars(cloud_config, minio_enabled=False),
+        refresh=False,
+    )
 
     if ret_code != 0:
         # Handle stale state gracefully
         if is_stale_state_error(stderr):
             print("  Stale state detected during MinIO destroy, clearing state...")
             clear_terraform_state(cloud_config.terraform_dir)
-            return True, time.time() - start  # State cleared, nothing to destroy
+            return True, time.monotonic() - start  # State cleared, nothing to destroy
         print(f"  Warning: MinIO destroy may have failed: {stderr}")
-        return False, time.time() - start
+        return False, time.monotonic() - start
 
-    duration = time.time() - start
+    duration = time.monotonic() - start
     print(f"  MinIO destroyed in {duration:.1f}s")
     return True, duration
 
 
+# Short warp run reported to the pruner before the full --autoterm run. Fewer
+# objects keep its prepare phase cheap; it only has to rank configs against
+# each other, so every trial uses the same probe.
+WARP_PROBE_ARGS = "--objects=250 --duration=30s"
+
+
 def run_warp_benchmark(
-    vm_ip: str, minio_ip: str = "10.0.0.10"
+    vm_ip: str, minio_ip: str = "10.0.0.10", run_args: str = "--autoterm"
 ) -> BenchmarkResult | None:
     """Run warp benchmark and parse results."""
-    print("  Running warp benchmark...")
+    print(f"  Running warp benchmark ({run_args})...")
 
     warp_cmd = (
         f"warp mixed "
@@ -579,17 +674,24 @@ def run_warp_benchmark(
         f"--stat-distrib 25 "
         f"--put-distrib 10 "
         f"--delete-distrib 5 "
-        f"--autoterm 2>&1"
+        f"{run_args} 2>&1"
     )
 
-    start_time = time.time()
+    def show_result_line(line: str) -> None:
+        if _WARP_RE.search(line):
+            print(f"    {line.strip()}")
+
+    start_time = time.monotonic()
     try:
-        code, output = run_ssh_command(vm_ip, warp_cmd, timeout=600)
+        # Stream warp's output and echo its result lines as they are printed
+        code, output = run_ssh_command(
+            vm_ip, warp_cmd, timeout=600, line_callback=show_result_line
+        )
     except Exception as e:
         print(f"  Warp failed: {e}")
         return None
 
-    duration = time.time() - start_time
+    duration = time.monotonic() - start_time
 
     if code != 0:
         print(f"  Warp failed: {output[:500]}")
@@ -598,6 +700,21 @@ def run_warp_benchmark(
     return parse_warp_output(output, duration)
 
 
+# Parse new warp output format
+# Operation: GET, 70%, Concurrency: 20, Ran 29s.
+#  * Throughput: 305.61 MiB/s, 305.61 obj/s
+# ...
+# Cluster Total: 371.93 MiB/s, 61.97 obj/s over 5m0s.
+# One alternation matched left to right: an operation header, a throughput
+# line (belongs to the last header) or the cluster total.
+_WARP_RE = re.compile(
+    r"Operation:\s*(\w+)"
+    r"|Throughput:\s*([\d.]+)\s*MiB/s,\s*([\d.]+)\s*obj/s"
+    r"|Cluster Total:\s*([\d.]+)\s*MiB/s,\s*([\d.]+)\s*obj/s",
+    re.IGNORECASE,
+)
+
+
 def parse_warp_output(output: str, duration: float) -> BenchmarkResult:
     """Parse warp benchmark output."""
     result = {
@@ -609,31 +726,20 @@ def parse_warp_output(output: str, duration: float) -> BenchmarkResult:
         "total_obj_s": 0.0,
     }
 
-    # Parse new warp output format
-    # Operation: GET, 70%, Concurrency: 20, Ran 29s.
-    #  * Throughput: 305.61 MiB/s, 305.61 obj/s
-    get_pattern = (
-        r"Operation:\s*GET.*?Throughput:\s*([\d.]+)\s*MiB/s,\s*([\d.]+)\s*obj/s"
-    )
-    put_pattern = (
-        r"Operation:\s*PUT.*?Throughput:\s*([\d.]+)\s*MiB/s,\s*([\d.]+)\s*obj/s"
-    )
-    total_pattern = r"Cluster Total:\s*([\d.]+)\s*MiB/s,\s*([\d.]+)\s*obj/s"
-
-    get_match = re.search(get_pattern, output, re.DOTALL | re.IGNORECASE)
-    if get_match:
-        result["get_mib_s"] = float(get_match.group(1))
-        result["get_obj_s"] = float(get_match.group(2))
-
-    put_match = re.search(put_pattern, output, re.DOTALL | re.IGNORECASE)
-    if put_match:
-        result["put_mib_s"] = float(put_match.group(1))
-        result["put_obj_s"] = float(put_match.group(2))
-
-    total_match = re.search(total_pattern, output, re.DOTALL | re.IGNORECASE)
-    if total_match:
-        result["total_mib_s"] = float(total_match.group(1))
-        result["total_obj_s"] = float(total_match.group(2))
+    # Single pass over the output; the first value of each kind wins
+    operation = None
+    for match in _WARP_RE.finditer(output):
+        header, mib_s, obj_s, total_mib_s, total_obj_s = match.groups()
+        if header:
+            operation = header.lower()
+        elif mib_s:
+            if operation in ("get", "put") and not result[f"{operation}_mib_s"]:
+                result[f"{operation}_mib_s"] = float(mib_s)
+                result[f"{operation}_obj_s"] = float(obj_s)
+            operation = None
+        elif not result["total_mib_s"]:
+            result["total_mib_s"] = float(total_mib_s)
+            result["total_obj_s"] = float(total_obj_s)
 
     if result["total_mib_s"] == 0:
         print(f"  Warning: Could not parse warp output. Sample: {output[:500]}...")
@@ -745,6 +851,12 @@ def parse_fio_output(output: str) -> FioResult | None:
         return None
 
 
+# sysbench output: "events per second: 1234.56" (cpu), "1234.56 MiB/sec" (memory)
+_SYSBENCH_CPU_RE = re.compile(r"events per second:\s*([\d.]+)")
+_SYSBENCH_MEM_RE = re.compile(r"([\d.]+)\s*MiB/sec")
+_SYSBENCH_SPLIT = "---SYSBENCH-MEMORY---"
+
+
 def run_sysbench_baseline(
     vm_ip: str, minio_ip: str = "10.0.0.10"
 ) -> SysbenchResult | None:
@@ -756,35 +868,26 @@ def run_sysbench_baseline(
 
     result = SysbenchResult()
 
-    # CPU benchmark
-    cpu_cmd = (
-        f"ssh -A -o StrictHostKeyChecking=no -o ConnectTimeout=10 root@{minio_ip} "
-        f'"sysbench cpu --time=10 run 2>/dev/null" 2>/dev/null'
-    )
-    try:
-        code, output = run_ssh_command(vm_ip, cpu_cmd, timeout=30, forward_agent=True)
-        if code == 0:
-            # Parse: events per second: 1234.56
-            match = re.search(r"events per second:\s*([\d.]+)", output)
-            if match:
-                result.cpu_events_per_sec = float(match.group(1))
-    except Exception as e:
-        print(f"  CPU benchmark failed: {e}")
-
-    # Memory benchmark
-    mem_cmd = (
+    # CPU then memory benchmark in one SSH round trip; the marker line splits
+    # their outputs
+    sysbench_cmd = (
         f"ssh -A -o StrictHostKeyChecking=no -o ConnectTimeout=10 root@{minio_ip} "
-        f'"sysbench memory --memory-block-size=1M --memory-total-size=10G run 2>/dev/null" 2>/dev/null'
+        f'"sysbench cpu --time=10 run 2>/dev/null; echo {_SYSBENCH_SPLIT}; '
+        f'sysbench memory --memory-block-size=1M --memory-total-size=10G run 2>/dev/null" 2>/dev/null'
     )
     try:
-        code, output = run_ssh_command(vm_ip, mem_cmd, timeout=30, forward_agent=True)
-        if code == 0:
-            # Parse: 1234.56 MiB/sec
-            match = re.search(r"([\d.]+)\s*MiB/sec", output)
-            if match:
-                result.mem_mib_per_sec = float(match.group(1))
+        _, output = run_ssh_command(vm_ip, sysbench_cmd, timeout=60, forward_agent=True)
+        cpu_output, _, mem_output = output.partition(_SYSBENCH_SPLIT)
+        # Parse: events per second: 1234.56
+        match = _SYSBENCH_CPU_RE.search(cpu_output)
+        if match:
+            result.cpu_events_per_sec = float(match.group(1))
+        # Parse: 1234.56 MiB/sec
+        match = _SYSBENCH_MEM_RE.search(mem_output)
+        if match:
+            result.mem_mib_per_sec = float(match.group(1))
     except Exception as e:
-        print(f"  Memory benchmark failed: {e}")
+        print(f"  Sysbench failed: {e}")
 
     print(
         f"  Sysbench: CPU {result.cpu_events_per_sec:.0f} events/s, "
@@ -809,21 +912,56 @@ def run_system_baseline(vm_ip: str, minio_ip: str = "10.0.0.10") -> SystemBaseli
 
 def calculate_cost(config: dict, cloud: str) -> float:
     """Estimate monthly cost for the configuration."""
+    return _config_cost(
+        cloud,
+        config["nodes"],
+        config["cpu_per_node"],
+        config["ram_per_node"],
+        config["drives_per_node"],
+        config["drive_size_gb"],
+        config["drive_type"],
+    )
+
+
+@lru_cache(maxsize=4096)
+def _config_cost(
+    cloud: str,
+    nodes: int,
+    cpu: int,
+    ram_gb: int,
+    drives: int,
+    drive_size_gb: int,
+    drive_type: str,
+) -> float:
+    """Cached cost of one config; the categorical search space keeps it small.
+
+    Results export, study seeding and every objective call cost the same
+    few configs over and over.
+    """
     return calculate_vm_cost(
         cloud=cloud,
-        cpu=config["cpu_per_node"],
-        ram_gb=config["ram_per_node"],
-        disks=[
-            DiskConfig(
-                size_gb=config["drive_size_gb"],
-                disk_type=config["drive_type"],
-                count=config["drives_per_node"],
-            )
-        ],
-        nodes=config["nodes"],
+        cpu=cpu,
+        ram_gb=ram_gb,
+        disks=[DiskConfig(size_gb=drive_size_gb, disk_type=drive_type, count=drives)],
+        nodes=nodes,
     )
 
 
+def benchmark_metric_value(
+    result: BenchmarkResult, config: dict, cloud: str, metric: str
+) -> float:
+    """Objective value for a benchmark result."""
+    cost = calculate_cost(config, cloud)
+    cost_efficiency = result.total_mib_s / cost if cost > 0 else 0
+    result_metrics = {
+        "total_mib_s": result.total_mib_s,
+        "get_mib_s": result.get_mib_s,
+        "put_mib_s": result.put_mib_s,
+        "cost_efficiency": cost_efficiency,
+    }
+    return get_metric_value(result_metrics, metric)
+
+
 def save_result(
     result: BenchmarkResult,
     config: dict,
@@ -832,8 +970,6 @@ def save_result(
     cloud_config: CloudConfig,
 ) -> None:
     """Save benchmark result to JSON file."""
-    results = load_results(results_file())
-
     total_drives = config["nodes"] * config["drives_per_node"]
 
     # Build baseline metrics dict if available
@@ -871,29 +1007,45 @@ def save_result(
             "trial_total_s": result.timings.trial_total_s,
         }
 
-    results.append(
-        {
-            "trial": trial_number,
-            "timestamp": datetime.now().isoformat(),
-            "cloud": cloud,
-            "config": config,
-            "total_drives": total_drives,
-            "total_mib_s": result.total_mib_s,
-            "get_mib_s": result.get_mib_s,
-            "put_mib_s": result.put_mib_s,
-            "duration_s": result.duration_s,
-            "error": result.error,
-            "system_baseline": baseline_metrics,
-            "timings": timings_metrics,
-        }
-    )
-
-    save_results(results, results_file())
+    record = {
+        "trial": trial_number,
+        "timestamp": datetime.now().isoformat(),
+        "cloud": cloud,
+        "config": config,
+        "total_drives": total_drives,
+        "total_mib_s": result.total_mib_s,
+        "get_mib_s": result.get_mib_s,
+        "put_mib_s": result.put_mib_s,
+        "duration_s": result.duration_s,
+        "error": result.error,
+        "system_baseline": baseline_metrics,
+        "timings": timings_metrics,
+    }
+    _RESULTS.append(record)
 
     # Auto-export markdown after each trial
     export_results_md(cloud)
 
 
+def revalidation_params(cloud: str, metric: str, top_k: int) -> list[dict]:
+    """Trial params of the best reusable past configs on this cloud, best first.
+
+    Configs outside the current search space are skipped.
+    """
+    distributions = search_distributions(cloud, get_config_space, SEARCH_PARAMS)
+    results = [r for r in _RESULTS.results() if r.get("cloud") == cloud]
+    results.sort(key=lambda r: stored_metric_value(r, cloud, metric), reverse=True)
+    params_list = []
+    for result in results:
+        params = trial_params(result["config"], SEARCH_PARAMS)
+        if all(
+            name in distributions and value in distributions[name].choices
+            for name, value in params.items()
+        ):
+            params_list.append(params)
+    return params_list[:top_k]
+
+
 def objective(
     trial: optuna.Trial,
     cloud: str,
@@ -902,59 +1054,61 @@ def objective(
     metric: str = "total_mib_s",
 ) -> float:
     """Optuna objective function."""
-    config_space = get_config_space(cloud)
+    distributions = search_distributions(cloud, get_config_space, SEARCH_PARAMS)
 
-    # Select CPU first, then filter valid RAM options for that CPU
-    cpu_per_node = trial.suggest_categorical(
-        "cpu_per_node", config_space["cpu_per_node"]
-    )
-    valid_ram = filter_valid_ram(cloud, cpu_per_node, config_space["ram_per_node"])
+    def suggest(name: str):
+        return trial.suggest_categorical(name, distributions[name].choices)
 
+    # Select CPU first; its RAM parameter only offers RAM valid for that CPU
+    cpu_per_node = suggest("cpu_per_node")
     config = {
-        "nodes": trial.suggest_categorical("nodes", config_space["nodes"]),
+        "nodes": suggest("nodes"),
         "cpu_per_node": cpu_per_node,
-        "ram_per_node": trial.suggest_categorical(
-            f"ram_per_node_cpu{cpu_per_node}", valid_ram
-        ),
-        "drives_per_node": trial.suggest_categorical(
-            "drives_per_node", config_space["drives_per_node"]
-        ),
-        "drive_size_gb": trial.suggest_categorical(
-            "drive_size_gb", config_space["drive_size_gb"]
-        ),
-        "drive_type": trial.suggest_categorical(
-            "drive_type", config_space["drive_type"]
-        ),
+        "ram_per_node": suggest(f"ram_per_node_cpu{cpu_per_node}"),
+        "drives_per_node": suggest("drives_per_node"),
+        "drive_size_gb": suggest("drive_size_gb"),
+        "drive_type": suggest("drive_type"),
     }
 
     print(f"\n{'=' * 60}")
     print(f"Trial {trial.number} [{cloud}]: {config}")
     print(f"{'=' * 60}")
 
-    # Check cache
+    # Check cache (re-validation trials always benchmark again)
     cached = find_cached_result(config, cloud)
-    if cached:
-        cached_value = get_metric_value(cached, metric)
+    if cached and "revalidates" not in trial.user_attrs:
+        cached_value = stored_metric_value(cached, cloud, metric)
         print(f"  Using cached result: {cached_value:.2f} ({metric})")
         return cached_value
 
     # Start timing the trial
-    trial_start = time.time()
+    trial_start = time.monotonic()
     timings = TrialTimings()
 
-    # Destroy any existing MinIO before deploying new config
-    # (volumes can't be shrunk, so we must recreate)
-    print("  Cleaning up previous MinIO deployment...")
-    _, cleanup_time = destroy_minio(cloud_config)
-    # OpenStack needs time to release ports/IPs, Timeweb is faster
-    post_destroy_wait = 15 if cloud == "selectel" else 5
-    time.sleep(post_destroy_wait)
-
-    # Deploy MinIO
-    success, deploy_time = deploy_minio(config, cloud_config, vm_ip)
-    timings.minio_deploy_s = deploy_time
+    # A cluster left by a pruned or failed trial of this same config is reused
+    deployed = get_deployed_config(cloud_config)
+    if deployed == config and wait_for_minio_ready(vm_ip, timeout=60):
+        print("  Reusing deployed MinIO cluster (same config)")
+        success = True
+    else:
+        # Destroy any existing MinIO before deploying new config
+        # (volumes can't be shrunk, so we must recreate), unless only the node
+        # size changed. Usually the previous trial already destroyed it, so
+        # skip the apply and wait then.
+        if deployed != config and can_resize_in_place(deployed, config, cloud):
+            print(f"  Resizing deployed MinIO nodes in place (was {deployed})")
+        elif has_minio_resources(cloud_config):
+            print("  Cleaning up previous MinIO deployment...")
+            destroy_minio(cloud_config)
+            # OpenStack needs time to release ports/IPs, Timeweb is faster
+            post_destroy_wait = 15 if cloud == "selectel" else 5
+            time.sleep(post_destroy_wait)
+
+        # Deploy MinIO
+        success, deploy_time = deploy_minio(config, cloud_config, vm_ip)
+        timings.minio_deploy_s = deploy_time
     if not success:
-        timings.trial_total_s = time.time() - trial_start
+        timings.trial_total_s = time.monotonic() - trial_start
         save_result(
             BenchmarkResult(config=config, error="Deploy failed", timings=timings),
             config,
@@ -965,17 +1119,26 @@ def objective(
         return 0.0
 
     # Run system baseline (fio + sysbench) on MinIO node
-    baseline_start = time.time()
+    baseline_start = time.monotonic()
     baseline = run_system_baseline(vm_ip)
-    timings.baseline_s = time.time() - baseline_start
+    timings.baseline_s = time.monotonic() - baseline_start
+
+    # Short probe first so the pruner can stop clearly worse configs early
+    probe = run_warp_benchmark(vm_ip, run_args=WARP_PROBE_ARGS)
+    if probe is not None:
+        probe_value = benchmark_metric_value(probe, config, cloud, metric)
+        trial.report(probe_value, step=0)
+        if trial.should_prune():
+            print(f"  Pruned after probe: {probe_value:.2f} ({metric})")
+            raise optuna.TrialPruned("Pruned after warp probe")
 
     # Run benchmark
-    benchmark_start = time.time()
+    benchmark_start = time.monotonic()
     result = run_warp_benchmark(vm_ip)
-    timings.benchmark_s = time.time() - benchmark_start
+    timings.benchmark_s = time.monotonic() - benchmark_start
 
     if result is None:
-        timings.trial_total_s = time.time() - trial_start
+        timings.trial_total_s = time.monotonic() - trial_start
         save_result(
             BenchmarkResult(
                 config=config,
@@ -993,7 +1156,7 @@ def objective(
     # Destroy MinIO after benchmark to measure destroy time
     _, destroy_time = destroy_minio(cloud_config)
     timings.minio_destroy_s = destroy_time
-    timings.trial_total_s = time.time() - trial_start
+    timings.trial_total_s = time.monotonic() - trial_start
 
     result.config = config
     result.baseline = baseline
@@ -1001,14 +1164,7 @@ def objective(
     save_result(result, config, trial.number, cloud, cloud_config)
 
     cost = calculate_cost(config, cloud)
-    cost_efficiency = result.total_mib_s / cost if cost > 0 else 0
-    result_metrics = {
-        "total_mib_s": result.total_mib_s,
-        "get_mib_s": result.get_mib_s,
-        "put_mib_s": result.put_mib_s,
-        "cost_efficiency": cost_efficiency,
-    }
-    metric_value = get_metric_value(result_metrics, metric)
+    metric_value = benchmark_metric_value(result, config, cloud, metric)
     print(
         f"  Result: {result.total_mib_s:.1f} MiB/s, Cost: {cost:.2f}/hr, {metric}={metric_value:.2f}"
     )
@@ -1019,6 +1175,41 @@ def objective(
     return metric_value
 
 
+def make_sampler(
+    n_trials: int, constant_liar: bool = False, n_startup_trials: int | None = None
+) -> TPESampler:
+    """Multivariate TPE, which models parameter interactions jointly.
+
+    Throughput depends on combinations (nodes x drives_per_node sets the
+    erasure-coding layout), which independent per-parameter TPE misses.
+    group=True lets it handle the CPU-specific ram_per_node_cpu{N} parameters.
+    n_startup_trials defaults to max(5, n_trials // 4).
+    """
+    if n_startup_trials is None:
+        n_startup_trials = max(5, n_trials // 4)
+    return TPESampler(
+        seed=42,
+        multivariate=True,
+        group=True,
+        n_startup_trials=n_startup_trials,
+        constant_liar=constant_liar,
+    )
+
+
+def objective_on_worker(
+    trial: optuna.Trial,
+    cloud: str,
+    workers: queue.Queue[tuple[CloudConfig, str]],
+    metric: str = "total_mib_s",
+) -> float:
+    """Run objective on a free worker's Terraform workspace and benchmark VM."""
+    cloud_config, vm_ip = workers.get()
+    try:
+        return objective(trial, cloud, cloud_config, vm_ip, metric)
+    finally:
+        workers.put((cloud_config, vm_ip))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Multi-Cloud MinIO Optimizer",
@@ -1037,6 +1228,9 @@ Examples:
   # Keep infrastructure after optimization
   uv run python minio-optimizer/optimizer.py --cloud timeweb --trials 5 --no-destroy
 
+  # Compare clouds: one study per cloud, run concurrently
+  uv run python minio-optimizer/optimizer.py --cloud selectel timeweb --trials 5
+
   # Show all results
   uv run python minio-optimizer/optimizer.py --cloud selectel --show-results
 
@@ -1046,9 +1240,10 @@ Examples:
     )
     parser.add_argument(
         "--cloud",
+        nargs="+",
         choices=["selectel", "timeweb"],
         required=True,
-        help="Cloud provider",
+        help="Cloud provider(s); several clouds run as concurrent studies",
     )
     parser.add_argument(
         "--metric",
@@ -1072,6 +1267,25 @@ Examples:
         default=None,
         help="Optuna study name (default: minio-{cloud}-{metric})",
     )
+    parser.add_argument(
+        "--parallel",
+        "-j",
+        type=int,
+        default=1,
+        help="Trials to run concurrently, each with its own benchmark VM and MinIO cluster",
+    )
+    parser.add_argument(
+        "--startup-trials",
+        type=int,
+        default=None,
+        help="Random trials before TPE starts modelling (default: max(5, trials/4))",
+    )
+    parser.add_argument(
+        "--revalidate-top",
+        type=int,
+        default=3,
+        help="Best past configs to benchmark again before TPE trials (default: 3)",
+    )
     parser.add_argument(
         "--no-destroy",
         action="store_true",
@@ -1089,50 +1303,109 @@ Examples:
     )
     args = parser.parse_args()
 
+    clouds = list(dict.fromkeys(args.cloud))
+
     # Handle --show-results
     if args.show_results:
-        show_results(args.cloud)
+        for cloud in clouds:
+            show_results(cloud)
         return
 
     # Handle --export-md
     if args.export_md:
-        export_results_md(args.cloud)
+        for cloud in clouds:
+            export_results_md(cloud)
+        return
+
+    if len(clouds) == 1:
+        run_optimization(clouds[0], args)
         return
 
-    cloud_config = get_cloud_config(args.cloud)
-    study_name = args.study_name or f"minio-{args.cloud}-{args.metric}"
+    if args.study_name or args.benchmark_vm_ip:
+        parser.error("--study-name and --benchmark-vm-ip need a single --cloud")
+
+    # Clouds share no infrastructure, so their studies run side by side; the
+    # journal storage and results file are safe for concurrent processes
+    with ProcessPoolExecutor(max_workers=len(clouds)) as pool:
+        futures = [pool.submit(run_optimization, cloud, args) for cloud in clouds]
+        for future in futures:
+            future.result()
+
+
+def run_optimization(cloud: str, args: argparse.Namespace) -> None:
+    """Run one cloud's study end to end (deploy, optimize, export, destroy)."""
+    cloud_config = get_cloud_config(cloud)
+    parallel = max(1, args.parallel)
+    study_name = args.study_name or f"minio-{cloud}-{args.metric}"
 
     print("=" * 60)
-    print(f"MinIO Optimizer - {args.cloud.upper()}")
+    print(f"MinIO Optimizer - {cloud.upper()}")
     print("=" * 60)
     print(f"Metric: {args.metric} ({METRICS[args.metric]})")
     print(f"Trials: {args.trials}")
+    print(f"Parallel: {parallel}")
     print(f"Terraform dir: {cloud_config.terraform_dir}")
     print(f"Results file: {results_file()}")
     print(f"Disk types: {cloud_config.disk_types}")
     print(f"Destroy at end: {not args.no_destroy}")
     print()
 
-    # Ensure benchmark VM exists
-    if args.benchmark_vm_ip:
-        vm_ip = args.benchmark_vm_ip
-        print(f"Using provided benchmark VM: {vm_ip}")
-    else:
-        vm_ip = ensure_benchmark_vm(cloud_config)
+    worker_configs = make_worker_configs(cloud_config, parallel)
+
+    # Ensure each worker's benchmark VM exists (the provided one is worker 0's)
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        futures = [pool.submit(ensure_benchmark_vm, c) for c in worker_configs[1:]]
+        if args.benchmark_vm_ip:
+            vm_ip = args.benchmark_vm_ip
+            print(f"Using provided benchmark VM: {vm_ip}")
+        else:
+            vm_ip = ensure_benchmark_vm(cloud_config)
+        vm_ips = [vm_ip, *(future.result() for future in futures)]
+
+    workers: queue.Queue[tuple[CloudConfig, str]] = queue.Queue()
+    for worker_config, worker_vm_ip in zip(worker_configs, vm_ips):
+        workers.put((worker_config, worker_vm_ip))
 
-    print(f"\nBenchmark VM IP: {vm_ip}")
+    print(f"\nBenchmark VM IP: {', '.join(vm_ips)}")
     print()
 
     # Create/load Optuna study
-    storage = f"sqlite:///{STUDY_DB}"
+    storage = open_study_storage(STUDY_JOURNAL, STUDY_DB)
     study = optuna.create_study(
         study_name=study_name,
         storage=storage,
         direction="maximize",
-        sampler=TPESampler(seed=42),
+        # constant_liar keeps concurrent trials from sampling the same point
+        sampler=make_sampler(
+            args.trials,
+            constant_liar=parallel > 1,
+            n_startup_trials=args.startup_trials,
+        ),
+        pruner=optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=0),
         load_if_exists=True,
     )
 
+    # Past results become completed trials, so they are never re-run and TPE
+    # starts from everything already measured
+    seeded = seed_study_from_results(
+        study,
+        [r for r in _RESULTS.results() if r.get("cloud") == cloud],
+        search_distributions(cloud, get_config_space, SEARCH_PARAMS),
+        SEARCH_PARAMS,
+        lambda r: stored_metric_value(r, cloud, args.metric),
+    )
+    if seeded:
+        print(f"Seeded study with {seeded} cached results")
+
+    # Benchmark the best known configs again first, so the opening trials check
+    # them on today's hosts instead of trusting the cache. Each is queued once
+    # per study, including across resumes.
+    queued = [t.user_attrs.get("revalidates") for t in study.get_trials(deepcopy=False)]
+    for params in revalidation_params(cloud, args.metric, args.revalidate_top):
+        if params not in queued:
+            study.enqueue_trial(params, user_attrs={"revalidates": params})
+            print(f"Queued re-validation of {params}")
+
     existing_trials = len(study.trials)
     if existing_trials > 0:
         print(f"Resuming study with {existing_trials} existing trials")
@@ -1147,16 +1420,16 @@ Examples:
     try:
         # Run optimization
         study.optimize(
-            lambda trial: objective(
-                trial, args.cloud, cloud_config, vm_ip, args.metric
-            ),
+            lambda trial: objective_on_worker(trial, cloud, workers, args.metric),
             n_trials=args.trials,
+            gc_after_trial=True,
+            n_jobs=parallel,
             show_progress_bar=True,
         )
 
         # Print results
         print("\n" + "=" * 60)
-        print(f"OPTIMIZATION COMPLETE ({args.cloud.upper()})")
+        print(f"OPTIMIZATION COMPLETE ({cloud.upper()})")
         print("=" * 60)
 
         try:
@@ -1166,19 +1439,20 @@ Examples:
             print(f"Best {args.metric}: {best.value:.2f}")
 
             # Calculate cost for best config
-            best_cost = calculate_cost(best.params, args.cloud)
+            best_cost = calculate_cost(best.params, cloud)
             print(f"Best config cost: {best_cost:.2f}/hr")
         except ValueError:
             print("No successful trials completed")
 
         # Auto-export results to markdown
-        export_results_md(args.cloud)
-        print(f"\nResults exported to RESULTS_{args.cloud.upper()}.md")
+        export_results_md(cloud)
+        print(f"\nResults exported to RESULTS_{cloud.upper()}.md")
 
     finally:
         # Cleanup
         if not args.no_destroy:
-            destroy_all(cloud_config.terraform_dir, cloud_config.name)
+            for worker_config in worker_configs:
+                destroy_workspace(worker_config)
         else:
             print("\n--no-destroy specified, keeping infrastructure.")
 
@@ -22,7 +22,6 @@ Usage:
 """
 
 import argparse
-import json
 import re
 import sys
 import time
@@ -30,6 +29,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
+from typing import Any
 
 import optuna
 from optuna.samplers import TPESampler
@@ -38,12 +38,13 @@ from optuna.samplers import TPESampler
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from common import (
+    ResultIndex,
     destroy_all,
     get_terraform,
-    get_tf_output,
+    get_tf_outputs,
     load_results,
+    open_study_storage,
     run_ssh_command,
-    save_results,
     wait_for_vm_ready,
 )
 
@@ -56,6 +57,8 @@ from cloud_config import (
 from pricing import DiskConfig, calculate_vm_cost, filter_valid_ram
 
 RESULTS_DIR = Path(__file__).parent
+STUDY_JOURNAL = RESULTS_DIR / "study.log"
+# Pre-journal SQLite study, migrated into STUDY_JOURNAL on first run
 STUDY_DB = RESULTS_DIR / "study.db"
 
 
@@ -108,27 +111,35 @@ def results_file() -> Path:
     return RESULTS_DIR / "results.json"
 
 
-def config_to_key(infra: dict, pg_config: dict, cloud: str) -> str:
-    """Convert config dicts to a hashable key for deduplication."""
-    return json.dumps({"cloud": cloud, "infra": infra, "pg": pg_config}, sort_keys=True)
+ConfigKey = tuple[str, tuple[tuple[str, Any], ...], tuple[tuple[str, Any], ...]]
+
+
+def config_to_key(infra: dict, pg_config: dict, cloud: str) -> ConfigKey:
+    """Convert config dicts to a hashable key for deduplication.
+
+    A tuple of sorted items: cheaper to build and hash than a JSON string.
+    """
+    return (cloud, tuple(sorted(infra.items())), tuple(sorted(pg_config.items())))
+
+
+def _is_reusable(result: dict) -> bool:
+    """Whether a stored result can stand in for re-running its config."""
+    return not result.get("error") and result.get("tps", 0) > 0
+
+
+# Successful results, consulted on every trial to skip re-benchmarking
+_RESULTS = ResultIndex(
+    results_file(),
+    key_fn=lambda r: config_to_key(
+        r.get("infra_config", {}), r.get("pg_config", {}), r.get("cloud", "")
+    ),
+    is_success=_is_reusable,
+)
 
 
 def find_cached_result(infra: dict, pg_config: dict, cloud: str) -> dict | None:
     """Find a cached successful result for the given config."""
-    target_key = config_to_key(infra, pg_config, cloud)
-    for result in load_results(results_file()):
-        result_key = config_to_key(
-            result.get("infra_config", {}),
-            result.get("pg_config", {}),
-            result.get("cloud", ""),
-        )
-        if result_key == target_key:
-            if result.get("error"):
-                return None
-            if result.get("tps", 0) <= 0:
-                return None
-            return result
-    return None
+    return _RESULTS.get(config_to_key(infra, pg_config, cloud))
 
 
 def generate_postgresql_conf(pg_config: dict, ram_gb: int) -> str:
@@ -205,7 +216,10 @@ def reconfigure_postgres_single(
         return False
 
     # Restart Postgres
-    restart_cmd = "systemctl restart postgresql && sleep 3 && pg_isready"
+    restart_cmd = (
+        "systemctl restart postgresql && "
+        "timeout 60 sh -c 'until pg_isready -q; do sleep 0.5; done' && pg_isready"
+    )
     code, output = run_ssh_command(vm_ip, restart_cmd, timeout=60, jump_host=jump_host)
     if code != 0:
         print(f"  Failed to restart Postgres: {output}")
@@ -265,10 +279,13 @@ def reconfigure_patroni(
     if code != 0:
         print(f"  Warning: Patroni restart returned non-zero: {output}")
 
-    # Wait for cluster to be healthy
-    time.sleep(10)
-    check_cmd = "patronictl -c /etc/patroni/patroni.yml list"
-    code, output = run_ssh_command(vm_ip, check_cmd, timeout=30, jump_host=jump_host)
+    # Wait (up to 60s) for a running leader, then show the cluster state
+    list_cmd = "patronictl -c /etc/patroni/patroni.yml list"
+    check_cmd = (
+        f'timeout 60 sh -c \'until {list_cmd} | grep -q "Leader.*running";'
+        f" do sleep 2; done'; {list_cmd}"
+    )
+    code, output = run_ssh_command(vm_ip, check_cmd, timeout=90, jump_host=jump_host)
     if "Leader" in output:
         print("  Patroni cluster reconfigured successfully")
         return True
@@ -286,8 +303,7 @@ def ensure_infra(
     tf = get_terraform(cloud_config.terraform_dir)
     mode = infra_config.get("mode", "single") if infra_config else "single"
 
-    postgres_ip = get_tf_output(tf, "postgres_vm_ip")
-    benchmark_ip = get_tf_output(tf, "benchmark_vm_ip")
+    postgres_ip, benchmark_ip = get_tf_outputs(tf, "postgres_vm_ip", "benchmark_vm_ip")
 
     if postgres_ip and benchmark_ip:
         print(f"  Found Postgres VM: {postgres_ip}")
@@ -303,7 +319,7 @@ def ensure_infra(
             pass
 
     print("  Creating infrastructure...")
-    tf_start = time.time()
+    tf_start = time.monotonic()
     tf_vars = {
         "postgres_enabled": True,
         "postgres_mode": mode,
@@ -322,15 +338,14 @@ def ensure_infra(
         )
 
     ret_code, stdout, stderr = tf.apply(skip_plan=True, var=tf_vars)
-    tf_elapsed = int(time.time() - tf_start)
+    tf_elapsed = int(time.monotonic() - tf_start)
 
     if ret_code != 0:
         raise RuntimeError(f"Failed to create infrastructure: {stderr}")
 
     print(f"  Infrastructure created in {tf_elapsed}s")
 
-    postgres_ip = get_tf_output(tf, "postgres_vm_ip")
-    benchmark_ip = get_tf_output(tf, "benchmark_vm_ip")
+    postgres_ip, benchmark_ip = get_tf_outputs(tf, "postgres_vm_ip", "benchmark_vm_ip")
 
     if not postgres_ip:
         raise RuntimeError("Postgres VM created but no IP returned")
@@ -360,8 +375,8 @@ def wait_for_patroni_ready(
     """Wait for Patroni cluster to be ready with a primary."""
     print("  Waiting for Patroni cluster to elect a primary...")
 
-    start = time.time()
-    while time.time() - start < timeout:
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
         try:
             # Check Patroni REST API
             code, output = run_ssh_command(
@@ -378,7 +393,7 @@ def wait_for_patroni_ready(
                     vm_ip, "pg_isready -h 127.0.0.1", timeout=10, jump_host=jump_host
                 )
                 if code2 == 0:
-                    print(f"  Patroni cluster ready! ({time.time() - start:.0f}s)")
+                    print(f"  Patroni cluster ready! ({time.monotonic() - start:.0f}s)")
                     return True
         except Exception:
             pass
@@ -394,14 +409,14 @@ def wait_for_postgres_ready(
     """Wait for Postgres to be ready."""
     print("  Waiting for Postgres to be ready...")
 
-    start = time.time()
-    while time.time() - start < timeout:
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
         try:
             code, output = run_ssh_command(
                 vm_ip, "pg_isready", timeout=10, jump_host=jump_host
             )
             if code == 0:
-                print(f"  Postgres is ready! ({time.time() - start:.0f}s)")
+                print(f"  Postgres is ready! ({time.monotonic() - start:.0f}s)")
                 return True
         except Exception:
             pass
@@ -453,13 +468,13 @@ def run_pgbench(
         f"postgres 2>&1"
     )
 
-    start_time = time.time()
+    start_time = time.monotonic()
     try:
         code, output = run_ssh_command(benchmark_ip, bench_cmd, timeout=duration + 60)
     except Exception as e:
         return BenchmarkResult(error=str(e))
 
-    elapsed = time.time() - start_time
+    elapsed = time.monotonic() - start_time
 
     if code != 0:
         return BenchmarkResult(error=output[:500])
@@ -467,27 +482,33 @@ def run_pgbench(
     return parse_pgbench_output(output, elapsed)
 
 
+_PGBENCH_TPS_RE = re.compile(r"tps = ([\d.]+) \(without initial connection time\)")
+_PGBENCH_LAT_AVG_RE = re.compile(r"latency average = ([\d.]+) ms")
+_PGBENCH_LAT_STD_RE = re.compile(r"latency stddev = ([\d.]+) ms")
+_PGBENCH_TXN_RE = re.compile(r"number of transactions actually processed: (\d+)")
+
+
 def parse_pgbench_output(output: str, duration: float) -> BenchmarkResult:
     """Parse pgbench output."""
     result = BenchmarkResult(duration_s=duration)
 
     # Parse TPS: tps = 1234.567890 (without initial connection time)
-    tps_match = re.search(r"tps = ([\d.]+) \(without initial connection time\)", output)
+    tps_match = _PGBENCH_TPS_RE.search(output)
     if tps_match:
         result.tps = float(tps_match.group(1))
 
     # Parse latency: latency average = 1.234 ms
-    lat_avg_match = re.search(r"latency average = ([\d.]+) ms", output)
+    lat_avg_match = _PGBENCH_LAT_AVG_RE.search(output)
     if lat_avg_match:
         result.latency_avg_ms = float(lat_avg_match.group(1))
 
     # Parse stddev: latency stddev = 0.567 ms
-    lat_std_match = re.search(r"latency stddev = ([\d.]+) ms", output)
+    lat_std_match = _PGBENCH_LAT_STD_RE.search(output)
     if lat_std_match:
         result.latency_stddev_ms = float(lat_std_match.group(1))
 
     # Parse transactions
-    txn_match = re.search(r"number of transactions actually processed: (\d+)", output)
+    txn_match = _PGBENCH_TXN_RE.search(output)
     if txn_match:
         result.transactions = int(txn_match.group(1))
 
@@ -522,8 +543,6 @@ def save_result(
     cloud_config: CloudConfig,
 ) -> None:
     """Save benchmark result to JSON file."""
-    results = load_results(results_file())
-
     timings_dict = None
     if result.timings:
         timings_dict = {
@@ -535,25 +554,22 @@ def save_result(
             "trial_total_s": result.timings.trial_total_s,
         }
 
-    results.append(
-        {
-            "trial": trial_number,
-            "timestamp": datetime.now().isoformat(),
-            "cloud": cloud,
-            "mode": mode,
-            "infra_config": infra_config,
-            "pg_config": pg_config,
-            "tps": result.tps,
-            "latency_avg_ms": result.latency_avg_ms,
-            "latency_stddev_ms": result.latency_stddev_ms,
-            "transactions": result.transactions,
-            "duration_s": result.duration_s,
-            "error": result.error,
-            "timings": timings_dict,
-        }
-    )
-
-    save_results(results, results_file())
+    record = {
+        "trial": trial_number,
+        "timestamp": datetime.now().isoformat(),
+        "cloud": cloud,
+        "mode": mode,
+        "infra_config": infra_config,
+        "pg_config": pg_config,
+        "tps": result.tps,
+        "latency_avg_ms": result.latency_avg_ms,
+        "latency_stddev_ms": result.latency_stddev_ms,
+        "transactions": result.transactions,
+        "duration_s": result.duration_s,
+        "error": result.error,
+        "timings": timings_dict,
+    }
+    _RESULTS.append(record)
 
     # Auto-export markdown after each trial
     export_results_md(cloud)
@@ -769,7 +785,7 @@ def objective_infra(
     print(f"\n{'=' * 60}")
     print(f"Trial {trial.number} [infra]: {infra_config}")
     print(f"{'=' * 60}")
-    trial_start = time.time()
+    trial_start = time.monotonic()
     timings = TrialTimings()
 
     # Check cache
@@ -786,9 +802,9 @@ def objective_infra(
 
     # Create VMs
     try:
-        infra_start = time.time()
+        infra_start = time.monotonic()
         benchmark_ip, postgres_ip = ensure_infra(cloud_config, infra_config)
-        timings.terraform_s = time.time() - infra_start
+        timings.terraform_s = time.monotonic() - infra_start
     except Exception as e:
         print(f"  Failed to create infrastructure: {e}")
         raise optuna.TrialPruned("Infrastructure creation failed")
@@ -801,24 +817,24 @@ def objective_infra(
         raise optuna.TrialPruned("Postgres config failed")
 
     # Initialize pgbench (scale based on RAM)
-    init_start = time.time()
+    init_start = time.monotonic()
     scale = max(50, ram_gb * 10)
     if not initialize_pgbench(postgres_ip, scale=scale, jump_host=benchmark_ip):
         raise optuna.TrialPruned("pgbench init failed")
-    timings.pgbench_init_s = time.time() - init_start
+    timings.pgbench_init_s = time.monotonic() - init_start
 
     # Run benchmark
-    bench_start = time.time()
+    bench_start = time.monotonic()
     result = run_pgbench(
         benchmark_ip, postgres_ip, clients=infra_config["cpu"] * 4, duration=60
     )
-    timings.benchmark_s = time.time() - bench_start
+    timings.benchmark_s = time.monotonic() - bench_start
 
     if result.error:
         print(f"  Benchmark failed: {result.error}")
         raise optuna.TrialPruned(result.error)
 
-    timings.trial_total_s = time.time() - trial_start
+    timings.trial_total_s = time.monotonic() - trial_start
     result.timings = timings
 
     print(f"  Result: {result.tps:.1f} TPS, {result.latency_avg_ms:.2f}ms latency")
@@ -895,7 +911,7 @@ def objective_config(
     print(f"\n{'=' * 60}")
     print(f"Trial {trial.number} [config]: {pg_summary(pg_config)}")
     print(f"{'=' * 60}")
-    trial_start = time.time()
+    trial_start = time.monotonic()
     timings = TrialTimings()
 
     # Check cache
@@ -913,17 +929,17 @@ def objective_config(
         raise optuna.TrialPruned("Postgres config failed")
 
     # Run benchmark
-    bench_start = time.time()
+    bench_start = time.monotonic()
     result = run_pgbench(
         benchmark_ip, postgres_ip, clients=infra_config["cpu"] * 4, duration=60
     )
-    timings.benchmark_s = time.time() - bench_start
+    timings.benchmark_s = time.monotonic() - bench_start
 
     if result.error:
         print(f"  Benchmark failed: {result.error}")
         raise optuna.TrialPruned(result.error)
 
-    timings.trial_total_s = time.time() - trial_start
+    timings.trial_total_s = time.monotonic() - trial_start
     result.timings = timings
 
     print(f"  Result: {result.tps:.1f} TPS, {result.latency_avg_ms:.2f}ms latency")
@@ -1000,6 +1016,7 @@ Examples:
     print(f"Metric: {args.metric} - {METRICS[args.metric]}")
     print(f"Trials: {args.trials}")
 
+    storage = open_study_storage(STUDY_JOURNAL, STUDY_DB)
     study: optuna.Study | None = None
 
     try:
@@ -1007,10 +1024,10 @@ Examples:
             # Infrastructure optimization
             study = optuna.create_study(
                 study_name=f"postgres-{args.cloud}-infra-{args.metric}",
-                storage=f"sqlite:///{STUDY_DB}",
+                storage=storage,
                 load_if_exists=True,
                 direction="maximize" if args.metric != "latency_avg_ms" else "minimize",
-                sampler=TPESampler(seed=42),
+                sampler=TPESampler(seed=42, multivariate=True, group=True),
             )
 
             study.optimize(
@@ -1018,6 +1035,7 @@ Examples:
                     trial, args.cloud, cloud_config, args.metric
                 ),
                 n_trials=args.trials,
+                gc_after_trial=True,
                 catch=(optuna.TrialPruned,),
             )
 
@@ -1043,10 +1061,10 @@ Examples:
 
             study = optuna.create_study(
                 study_name=f"postgres-{args.cloud}-config-{args.metric}",
-                storage=f"sqlite:///{STUDY_DB}",
+                storage=storage,
                 load_if_exists=True,
                 direction="maximize" if args.metric != "latency_avg_ms" else "minimize",
-                sampler=TPESampler(seed=42),
+                sampler=TPESampler(seed=42, multivariate=True, group=True),
             )
 
             study.optimize(
@@ -1060,6 +1078,7 @@ Examples:
                     args.metric,
                 ),
                 n_trials=args.trials,
+                gc_after_trial=True,
                 catch=(optuna.TrialPruned,),
             )
 
@@ -1069,10 +1088,10 @@ Examples:
 
             study_infra = optuna.create_study(
                 study_name=f"postgres-{args.cloud}-full-infra-{args.metric}",
-                storage=f"sqlite:///{STUDY_DB}",
+                storage=storage,
                 load_if_exists=True,
                 direction="maximize",
-                sampler=TPESampler(seed=42),
+                sampler=TPESampler(seed=42, multivariate=True, group=True),
             )
 
             infra_trials = max(5, args.trials // 3)
@@ -1081,6 +1100,7 @@ Examples:
                     trial, args.cloud, cloud_config, args.metric
                 ),
                 n_trials=infra_trials,
+                gc_after_trial=True,
                 catch=(optuna.TrialPruned,),
             )
 
@@ -1105,10 +1125,10 @@ Examples:
 
             study_config = optuna.create_study(
                 study_name=f"postgres-{args.cloud}-full-config-{args.metric}",
-                storage=f"sqlite:///{STUDY_DB}",
+                storage=storage,
                 load_if_exists=True,
                 direction="maximize" if args.metric != "latency_avg_ms" else "minimize",
-                sampler=TPESampler(seed=42),
+                sampler=TPESampler(seed=42, multivariate=True, group=True),
             )
 
             config_trials = args.trials - infra_trials
@@ -1123,6 +1143,7 @@ Examples:
                     args.metric,
                 ),
                 n_trials=config_trials,
+                gc_after_trial=True,
                 catch=(optuna.TrialPruned,),
             )
 
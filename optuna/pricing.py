@@ -154,9 +154,10 @@ def calculate_vm_cost(
     cpu_cost = cpu * pricing.cpu_cost
     ram_cost = ram_gb * pricing.ram_cost
 
+    multipliers = pricing.disk_cost_multipliers
     disk_cost = 0.0
     for disk in disks:
-        multiplier = pricing.disk_cost_multipliers.get(disk.disk_type, 0.01)
+        multiplier = multipliers.get(disk.disk_type, 0.01)
         disk_cost += disk.size_gb * disk.count * multiplier
 
     return nodes * (cpu_cost + ram_cost + disk_cost)
@@ -14,7 +14,6 @@ Usage:
 """
 
 import argparse
-import json
 import re
 import sys
 import time
@@ -29,20 +28,26 @@ from optuna.samplers import TPESampler
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from common import (
+    ResultIndex,
+    cached_metric_value,
     clear_known_hosts_on_vm,
     destroy_all,
     get_terraform,
     get_tf_output,
     load_results,
+    open_study_storage,
     run_ssh_command,
-    save_results,
+    search_distributions,
+    seed_study_from_results,
     wait_for_vm_ready,
 )
 
 from cloud_config import CloudConfig, get_cloud_config, get_config_space
-from pricing import DiskConfig, calculate_vm_cost, filter_valid_ram
+from pricing import DiskConfig, calculate_vm_cost
 
 RESULTS_DIR = Path(__file__).parent
+STUDY_JOURNAL = RESULTS_DIR / "study.log"
+# Pre-journal SQLite study, migrated into STUDY_JOURNAL on first run
 STUDY_DB = RESULTS_DIR / "study.db"
 
 # Available optimization metrics
@@ -249,33 +254,41 @@ class BenchmarkResult:
     timings: TrialTimings | None = None
 
 
-def config_to_key(config: dict, cloud: str) -> str:
-    """Convert config dict to a hashable key for deduplication."""
-    return json.dumps(
-        {
-            "cloud": cloud,
-            "mode": config["mode"],
-            "cpu_per_node": config["cpu_per_node"],
-            "ram_per_node": config["ram_per_node"],
-            "maxmemory_policy": config["maxmemory_policy"],
-            "io_threads": config["io_threads"],
-            "persistence": config["persistence"],
-        },
-        sort_keys=True,
+ConfigKey = tuple[str, str, int, int, str, int, str]
+
+
+def config_to_key(config: dict, cloud: str) -> ConfigKey:
+    """Convert config dict to a hashable key for deduplication.
+
+    A plain tuple: cheaper to build and hash than a JSON string.
+    """
+    return (
+        cloud,
+        config["mode"],
+        config["cpu_per_node"],
+        config["ram_per_node"],
+        config["maxmemory_policy"],
+        config["io_threads"],
+        config["persistence"],
     )
 
 
+def _is_reusable(result: dict) -> bool:
+    """Whether a stored result can stand in for re-running its config."""
+    return not result.get("error") and result.get("ops_per_sec", 0) > 0
+
+
+# Successful results, consulted on every trial to skip re-benchmarking
+_RESULTS = ResultIndex(
+    results_file(),
+    key_fn=lambda r: config_to_key(r["config"], r.get("cloud", "")),
+    is_success=_is_reusable,
+)
+
+
 def find_cached_result(config: dict, cloud: str) -> dict | None:
     """Find a cached successful result for the given config."""
-    target_key = config_to_key(config, cloud)
-    for result in load_results(results_file()):
-        if config_to_key(result["config"], result.get("cloud", "")) == target_key:
-            if result.get("error"):
-                return None
-            if result.get("ops_per_sec", 0) <= 0:
-                return None
-            return result
-    return None
+    return _RESULTS.get(config_to_key(config, cloud))
 
 
 def wait_for_redis_ready(
@@ -286,9 +299,9 @@ def wait_for_redis_ready(
 
     print(f"  Waiting for Redis at {redis_ip} to be ready...")
 
-    start = time.time()
-    while time.time() - start < timeout:
-        elapsed = time.time() - start
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
+        elapsed = time.monotonic() - start
         try:
             check_cmd = (
                 f"ssh -A -o StrictHostKeyChecking=no -o ConnectTimeout=5 root@{redis_ip} "
@@ -365,7 +378,7 @@ def deploy_redis(
 ) -> tuple[bool, float]:
     """Deploy Redis with given configuration."""
     print(f"  Deploying Redis on {cloud_config.name}: {config}")
-    start = time.time()
+    start = time.monotonic()
 
     tf = get_terraform(cloud_config.terraform_dir)
 
@@ -384,12 +397,12 @@ def deploy_redis(
 
     if ret_code != 0:
         print(f"  Terraform apply failed: {stderr}")
-        return False, time.time() - start
+        return False, time.monotonic() - start
 
     if not wait_for_redis_ready(vm_ip):
         print("  Warning: Redis may not be fully ready")
 
-    duration = time.time() - start
+    duration = time.monotonic() - start
     print(f"  Redis deployed in {duration:.1f}s")
     return True, duration
 
@@ -397,7 +410,7 @@ def deploy_redis(
 def destroy_redis(cloud_config: CloudConfig) -> tuple[bool, float]:
     """Destroy Redis but keep benchmark VM."""
     print(f"  Destroying Redis on {cloud_config.name}...")
-    start = time.time()
+    start = time.monotonic()
 
     tf = get_terraform(cloud_config.terraform_dir)
     ret_code, stdout, stderr = tf.apply(
@@ -406,9 +419,9 @@ def destroy_redis(cloud_config: CloudConfig) -> tuple[bool, float]:
 
     if ret_code != 0:
         print(f"  Warning: Redis destroy may have failed: {stderr}")
-        return False, time.time() - start
+        return False, time.monotonic() - start
 
-    duration = time.time() - start
+    duration = time.monotonic() - start
     print(f"  Redis destroyed in {duration:.1f}s")
     return True, duration
 
@@ -436,14 +449,14 @@ def run_memtier_benchmark(
         f"2>&1"
     )
 
-    start_time = time.time()
+    start_time = time.monotonic()
     try:
         code, output = run_ssh_command(vm_ip, memtier_cmd, timeout=duration + 60)
     except Exception as e:
         print(f"  Memtier failed: {e}")
         return None
 
-    elapsed = time.time() - start_time
+    elapsed = time.monotonic() - start_time
 
     if code != 0:
         print(f"  Memtier failed: {output[:500]}")
@@ -452,16 +465,19 @@ def run_memtier_benchmark(
     return parse_memtier_output(output, elapsed)
 
 
+# Totals line of memtier_benchmark output:
+# Type         Ops/sec     Hits/sec   Misses/sec    Avg. Latency     p50 Latency     p99 Latency   p99.9 Latency       KB/sec
+# Totals     123456.78     98765.43       0.00         1.234           1.111           2.345           5.678        12345.67
+_MEMTIER_TOTALS_RE = re.compile(
+    r"Totals\s+([\d.]+)\s+[\d.]+\s+[\d.]+\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)"
+)
+
+
 def parse_memtier_output(output: str, duration: float) -> BenchmarkResult:
     """Parse memtier_benchmark output."""
     result = BenchmarkResult(config={}, duration_s=duration)
 
-    # Parse Totals line:
-    # Type         Ops/sec     Hits/sec   Misses/sec    Avg. Latency     p50 Latency     p99 Latency   p99.9 Latency       KB/sec
-    # Totals     123456.78     98765.43       0.00         1.234           1.111           2.345           5.678        12345.67
-
-    totals_pattern = r"Totals\s+([\d.]+)\s+[\d.]+\s+[\d.]+\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)"
-    match = re.search(totals_pattern, output)
+    match = _MEMTIER_TOTALS_RE.search(output)
     if match:
         result.ops_per_sec = float(match.group(1))
         result.avg_latency_ms = float(match.group(2))
@@ -495,8 +511,6 @@ def save_result(
     cloud_config: CloudConfig,
 ) -> None:
     """Save benchmark result to JSON file."""
-    results = load_results(results_file())
-
     timings_dict = None
     if result.timings:
         timings_dict = {
@@ -505,26 +519,23 @@ def save_result(
             "trial_total_s": result.timings.trial_total_s,
         }
 
-    results.append(
-        {
-            "trial": trial_number,
-            "timestamp": datetime.now().isoformat(),
-            "cloud": cloud,
-            "config": config,
-            "nodes": 1 if config["mode"] == "single" else 3,
-            "ops_per_sec": result.ops_per_sec,
-            "avg_latency_ms": result.avg_latency_ms,
-            "p50_latency_ms": result.p50_latency_ms,
-            "p99_latency_ms": result.p99_latency_ms,
-            "p999_latency_ms": result.p999_latency_ms,
-            "kb_per_sec": result.kb_per_sec,
-            "duration_s": result.duration_s,
-            "error": result.error,
-            "timings": timings_dict,
-        }
-    )
-
-    save_results(results, results_file())
+    record = {
+        "trial": trial_number,
+        "timestamp": datetime.now().isoformat(),
+        "cloud": cloud,
+        "config": config,
+        "nodes": 1 if config["mode"] == "single" else 3,
+        "ops_per_sec": result.ops_per_sec,
+        "avg_latency_ms": result.avg_latency_ms,
+        "p50_latency_ms": result.p50_latency_ms,
+        "p99_latency_ms": result.p99_latency_ms,
+        "p999_latency_ms": result.p999_latency_ms,
+        "kb_per_sec": result.kb_per_sec,
+        "duration_s": result.duration_s,
+        "error": result.error,
+        "timings": timings_dict,
+    }
+    _RESULTS.append(record)
 
     # Auto-export markdown after each trial
     export_results_md(cloud)
@@ -539,6 +550,27 @@ def get_metric_value(result: dict, metric: str) -> float:
     return result.get(metric, 0)
 
 
+# Trial parameters taken from the config space as-is (RAM is per CPU count)
+SEARCH_PARAMS = (
+    "mode",
+    "cpu_per_node",
+    "maxmemory_policy",
+    "io_threads",
+    "persistence",
+)
+
+
+def stored_metric_value(result: dict, cloud: str, metric: str) -> float:
+    """Objective value of a stored result."""
+    return cached_metric_value(
+        result,
+        metric,
+        "ops_per_sec",
+        lambda config: calculate_cost(config, cloud),
+        get_metric_value,
+    )
+
+
 def objective(
     trial: optuna.Trial,
     cloud: str,
@@ -547,40 +579,31 @@ def objective(
     metric: str = "ops_per_sec",
 ) -> float:
     """Optuna objective function."""
-    config_space = get_config_space(cloud)
+    distributions = search_distributions(cloud, get_config_space, SEARCH_PARAMS)
 
-    # Select CPU first, then filter valid RAM options for that CPU
-    cpu_per_node = trial.suggest_categorical(
-        "cpu_per_node", config_space["cpu_per_node"]
-    )
-    valid_ram = filter_valid_ram(cloud, cpu_per_node, config_space["ram_per_node"])
+    def suggest(name: str):
+        return trial.suggest_categorical(name, distributions[name].choices)
 
+    # Select CPU first; its RAM parameter only offers RAM valid for that CPU
+    cpu_per_node = suggest("cpu_per_node")
     config = {
-        "mode": trial.suggest_categorical("mode", config_space["mode"]),
+        "mode": suggest("mode"),
         "cpu_per_node": cpu_per_node,
-        "ram_per_node": trial.suggest_categorical(
-            f"ram_per_node_cpu{cpu_per_node}", valid_ram
-        ),
-        "maxmemory_policy": trial.suggest_categorical(
-            "maxmemory_policy", config_space["maxmemory_policy"]
-        ),
-        "io_threads": trial.suggest_categorical(
-            "io_threads", config_space["io_threads"]
-        ),
-        "persistence": trial.suggest_categorical(
-            "persistence", config_space["persistence"]
-        ),
+        "ram_per_node": suggest(f"ram_per_node_cpu{cpu_per_node}"),
+        "maxmemory_policy": suggest("maxmemory_policy"),
+        "io_threads": suggest("io_threads"),
+        "persistence": suggest("persistence"),
     }
 
     print(f"\n{'=' * 60}")
     print(f"Trial {trial.number} [{cloud}]: {config}")
     print(f"{'=' * 60}")
-    trial_start = time.time()
+    trial_start = time.monotonic()
 
     # Check cache
     cached = find_cached_result(config, cloud)
     if cached:
-        cached_value = get_metric_value(cached, metric)
+        cached_value = stored_metric_value(cached, cloud, metric)
         print(f"  Using cached result: {cached_value:.2f} ({metric})")
         return cached_value
 
@@ -599,15 +622,15 @@ def objective(
         raise optuna.TrialPruned("Deploy failed")
 
     # Run benchmark
-    bench_start = time.time()
+    bench_start = time.monotonic()
     result = run_memtier_benchmark(vm_ip)
-    timings.benchmark_s = time.time() - bench_start
+    timings.benchmark_s = time.monotonic() - bench_start
 
     if result is None or result.ops_per_sec == 0:
         print("  Benchmark failed - marking trial as pruned (will retry config later)")
         raise optuna.TrialPruned("Benchmark failed")
 
-    timings.trial_total_s = time.time() - trial_start
+    timings.trial_total_s = time.monotonic() - trial_start
     result.config = config
     result.timings = timings
     save_result(result, config, trial.number, cloud, cloud_config)
@@ -731,15 +754,26 @@ Examples:
     print()
 
     # Create/load Optuna study
-    storage = f"sqlite:///{STUDY_DB}"
+    storage = open_study_storage(STUDY_JOURNAL, STUDY_DB)
     study = optuna.create_study(
         study_name=study_name,
         storage=storage,
         direction="maximize",
-        sampler=TPESampler(seed=42),
+        sampler=TPESampler(seed=42, multivariate=True, group=True),
         load_if_exists=True,
     )
 
+    # Cached results become completed trials, so TPE never re-suggests them
+    seeded = seed_study_from_results(
+        study,
+        [r for r in _RESULTS.results() if r.get("cloud") == args.cloud],
+        search_distributions(args.cloud, get_config_space, SEARCH_PARAMS),
+        SEARCH_PARAMS,
+        lambda r: stored_metric_value(r, args.cloud, args.metric),
+    )
+    if seeded:
+        print(f"Seeded study with {seeded} cached results")
+
     existing_trials = len(study.trials)
     if existing_trials > 0:
         print(f"Resuming study with {existing_trials} existing trials")
@@ -756,6 +790,7 @@ Examples:
                 trial, args.cloud, cloud_config, vm_ip, args.metric
             ),
             n_trials=args.trials,
+            gc_after_trial=True,
             show_progress_bar=True,
         )
 
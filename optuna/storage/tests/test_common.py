@@ -0,0 +1,244 @@
+"""Tests for the pure helpers in common."""
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import optuna
+import pytest
+from python_terraform import Terraform
+
+from common import (
+    ResultIndex,
+    _run_streaming,
+    append_result,
+    get_tf_outputs,
+    load_results,
+    save_results,
+    search_distributions,
+    seed_study_from_results,
+)
+
+SEARCH_PARAMS = ("mode", "cpu_per_node")
+
+
+def get_space(cloud: str) -> dict[str, Any]:
+    """Small config space for seeding tests."""
+    return {
+        "mode": ["single", "sentinel"],
+        "cpu_per_node": [2, 4],
+        "ram_per_node": [4, 8],
+    }
+
+
+def make_config(mode: str = "single", cpu: int = 2, ram: int = 4) -> dict[str, Any]:
+    return {"mode": mode, "cpu_per_node": cpu, "ram_per_node": ram}
+
+
+class TestAppendResult:
+    """Tests for append_result."""
+
+    def test_matches_save_results(self, tmp_path: Path):
+        """Appending one by one should write the same bytes as save_results."""
+        results = [
+            {"trial": i, "nested": {"a": [1, 2]}, "error": None} for i in range(3)
+        ]
+        appended = tmp_path / "appended.json"
+        saved = tmp_path / "saved.json"
+
+        for result in results:
+            append_result(result, appended)
+        save_results(results, saved)
+
+        assert appended.read_bytes() == saved.read_bytes()
+        assert load_results(appended) == results
+
+    def test_empty_file(self, tmp_path: Path):
+        """An existing empty file should be treated as an empty list."""
+        path = tmp_path / "results.json"
+        path.touch()
+
+        append_result({"trial": 0}, path)
+
+        assert json.loads(path.read_text()) == [{"trial": 0}]
+
+    def test_empty_list_file(self, tmp_path: Path):
+        """A file holding [] should be extended without a leading comma."""
+        path = tmp_path / "results.json"
+        expected = tmp_path / "expected.json"
+        save_results([], path)
+
+        append_result({"trial": 0}, path)
+        save_results([{"trial": 0}], expected)
+
+        assert path.read_bytes() == expected.read_bytes()
+
+
+class TestResultIndex:
+    """Tests for ResultIndex."""
+
+    @staticmethod
+    def make_index(path: Path) -> ResultIndex[int]:
+        return ResultIndex(
+            path, key_fn=lambda r: r["key"], is_success=lambda r: r["value"] > 0
+        )
+
+    def test_missing_file(self, tmp_path: Path):
+        """A missing results file should index nothing."""
+        index = self.make_index(tmp_path / "results.json")
+        assert index.get(1) is None
+        assert index.results() == []
+
+    def test_first_success_wins(self, tmp_path: Path):
+        """Failed results are skipped and the first success per key is kept."""
+        index = self.make_index(tmp_path / "results.json")
+        index.append({"key": 1, "value": 0})
+        index.append({"key": 1, "value": 5})
+        index.append({"key": 1, "value": 7})
+
+        assert index.get(1) == {"key": 1, "value": 5}
+
+    def test_picks_up_external_writes(self, tmp_path: Path):
+        """Results written by another process should be seen on the next lookup."""
+        path = tmp_path / "results.json"
+        index = self.make_index(path)
+        assert index.get(2) is None
+
+        append_result({"key": 2, "value": 3}, path)
+
+        assert index.get(2) == {"key": 2, "value": 3}
+
+
+class TestRunStreaming:
+    """Tests for _run_streaming."""
+
+    def test_streams_lines(self):
+        """Each line should reach the callback, and the output is returned."""
+        lines: list[str] = []
+        code, output = _run_streaming(
+            [sys.executable, "-c", "print('a'); print('b')"], 10, lines.append
+        )
+
+        assert code == 0
+        assert lines == ["a", "b"]
+        assert output == "a\nb\n"
+
+    def test_timeout(self):
+        """A command outliving its timeout is killed, keeping the output so far."""
+        cmd = [
+            sys.executable,
+            "-c",
+            "import time; print('started', flush=True); time.sleep(30)",
+        ]
+        start = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired) as exc_info:
+            _run_streaming(cmd, 1, lambda line: None)
+
+        assert time.monotonic() - start < 10
+        assert exc_info.value.output == "started\n"
+
+    def test_callback_raises(self):
+        """An exception from the callback stops the command and propagates."""
+        cmd = [
+            sys.executable,
+            "-c",
+            "import time; print('line', flush=True); time.sleep(30)",
+        ]
+
+        def fail(line: str) -> None:
+            raise RuntimeError(line)
+
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="line"):
+            _run_streaming(cmd, 60, fail)
+
+        assert time.monotonic() - start < 10
+
+
+class TestGetTfOutputs:
+    """Tests for get_tf_outputs."""
+
+    def test_values(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Outputs are returned in order; missing and null ones are None."""
+        tf = Terraform(working_dir=str(tmp_path))
+        outputs = {
+            "vm_ip": {"value": "10.0.0.5", "type": "string"},
+            "count": {"value": 3, "type": "number"},
+            "empty": {"value": None, "type": "string"},
+        }
+        monkeypatch.setattr(tf, "output", lambda *args, **kwargs: outputs)
+
+        assert get_tf_outputs(tf, "vm_ip", "count", "empty", "missing") == (
+            "10.0.0.5",
+            "3",
+            None,
+            None,
+        )
+
+    def test_no_state(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Unparseable output (no state yet) should give all None."""
+        tf = Terraform(working_dir=str(tmp_path))
+
+        def no_state(*args: Any, **kwargs: Any) -> dict[str, Any]:
+            raise ValueError("Expecting value")
+
+        monkeypatch.setattr(tf, "output", no_state)
+
+        assert get_tf_outputs(tf, "vm_ip", "count") == (None, None)
+
+
+class TestSeedStudyFromResults:
+    """Tests for seed_study_from_results."""
+
+    @staticmethod
+    def seed(study: optuna.Study, results: list[dict[str, Any]]) -> int:
+        return seed_study_from_results(
+            study,
+            results,
+            search_distributions("selectel", get_space, SEARCH_PARAMS),
+            SEARCH_PARAMS,
+            lambda r: r["value"],
+        )
+
+    def test_adds_completed_trials(self):
+        """Each result becomes a completed trial with its value."""
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        study = optuna.create_study(direction="maximize")
+        results = [
+            {"config": make_config(), "value": 1.0},
+            {"config": make_config("sentinel", 4, 8), "value": 2.0},
+        ]
+
+        assert self.seed(study, results) == 2
+        assert [t.value for t in study.trials] == [1.0, 2.0]
+        assert study.trials[1].params == {
+            "mode": "sentinel",
+            "cpu_per_node": 4,
+            "ram_per_node_cpu4": 8,
+        }
+
+    def test_skips_existing_params(self):
+        """Configs already in the study are not added again."""
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        study = optuna.create_study(direction="maximize")
+        results = [{"config": make_config(), "value": 1.0}]
+
+        assert self.seed(study, results) == 1
+        assert self.seed(study, results) == 0
+        assert len(study.trials) == 1
+
+    def test_skips_choices_outside_space(self):
+        """Configs with a value outside the search space are skipped."""
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        study = optuna.create_study(direction="maximize")
+        results = [
+            {"config": make_config(mode="cluster"), "value": 1.0},
+            {"config": make_config(cpu=16), "value": 2.0},
+            {"config": make_config(ram=64), "value": 3.0},
+        ]
+
+        assert self.seed(study, results) == 0
+        assert study.trials == []
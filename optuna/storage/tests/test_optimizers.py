@@ -0,0 +1,152 @@
+"""Tests for pure helpers in the optimizer scripts."""
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+OPTUNA_DIR = Path(__file__).parent.parent.parent
+
+
+def load_optimizer(name: str) -> ModuleType:
+    """Import <name>-optimizer/optimizer.py with its own cloud_config module."""
+    optimizer_dir = OPTUNA_DIR / f"{name}-optimizer"
+    sys.modules.pop("cloud_config", None)
+    sys.path.insert(0, str(optimizer_dir))
+    try:
+        spec = importlib.util.spec_from_file_location(
+            f"{name.replace('-', '_')}_optimizer", optimizer_dir / "optimizer.py"
+        )
+        assert spec and spec.loader
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        sys.path.remove(str(optimizer_dir))
+        sys.modules.pop("cloud_config", None)
+
+
+@pytest.fixture(scope="module")
+def minio() -> ModuleType:
+    return load_optimizer("minio")
+
+
+@pytest.fixture(scope="module")
+def redis() -> ModuleType:
+    return load_optimizer("redis")
+
+
+@pytest.fixture(scope="module")
+def postgres() -> ModuleType:
+    return load_optimizer("postgres")
+
+
+@pytest.fixture(scope="module")
+def meilisearch() -> ModuleType:
+    return load_optimizer("meilisearch")
+
+
+WARP_OUTPUT = """\
+Operation: PUT, 30%, Concurrency: 20, Ran 29s.
+ * Throughput: 110.50 MiB/s, 18.42 obj/s
+
+Operation: GET, 70%, Concurrency: 20, Ran 29s.
+ * Throughput: 305.61 MiB/s, 305.61 obj/s
+
+Throughput by host:
+ * http://10.0.0.10:9000: Avg: 305.61 MiB/s, 305.61 obj/s
+
+Cluster Total: 416.11 MiB/s, 324.03 obj/s over 5m0s.
+Operation: GET
+ * Throughput: 999.00 MiB/s, 999.00 obj/s
+Cluster Total: 999.00 MiB/s, 999.00 obj/s over 5m0s.
+"""
+
+
+class TestParseWarpOutput:
+    """Tests for the MinIO warp output parser."""
+
+    def test_operation_headers(self, minio: ModuleType):
+        """Throughput lines are attributed to the preceding GET/PUT header."""
+        result = minio.parse_warp_output(WARP_OUTPUT, 300.0)
+
+        assert result.get_mib_s == 305.61
+        assert result.get_obj_s == 305.61
+        assert result.put_mib_s == 110.50
+        assert result.put_obj_s == 18.42
+        assert result.duration_s == 300.0
+
+    def test_first_value_wins(self, minio: ModuleType):
+        """Later repeats (and per-host lines) don't overwrite the first values."""
+        result = minio.parse_warp_output(WARP_OUTPUT, 300.0)
+
+        assert result.total_mib_s == 416.11
+        assert result.total_obj_s == 324.03
+
+    def test_unparseable(self, minio: ModuleType):
+        """Output without results gives zero throughput."""
+        result = minio.parse_warp_output("warp: connection refused", 1.0)
+
+        assert result.total_mib_s == 0
+        assert result.get_mib_s == 0
+
+    def test_result_lines_match(self, minio: ModuleType):
+        """The echo filter matches the header, throughput and total lines only."""
+        lines = WARP_OUTPUT.splitlines()
+        matched = [line for line in lines if minio._WARP_RE.search(line)]
+
+        assert len(matched) == 8
+        assert not any("by host" in line or "Avg:" in line for line in matched)
+
+
+class TestConfigToKey:
+    """Tests for the tuple config keys used by the result caches."""
+
+    def test_minio(self, minio: ModuleType):
+        config = {
+            "nodes": 2,
+            "cpu_per_node": 4,
+            "ram_per_node": 8,
+            "drives_per_node": 2,
+            "drive_size_gb": 100,
+            "drive_type": "fast",
+        }
+        reordered = dict(reversed(list(config.items())))
+
+        key = minio.config_to_key(config, "selectel")
+        assert key == minio.config_to_key(reordered, "selectel")
+        assert key != minio.config_to_key(config, "timeweb")
+        assert key != minio.config_to_key({**config, "nodes": 3}, "selectel")
+        assert hash(key) == hash(minio.config_to_key(reordered, "selectel"))
+
+    def test_redis(self, redis: ModuleType):
+        config = {
+            "mode": "single",
+            "cpu_per_node": 2,
+            "ram_per_node": 4,
+            "maxmemory_policy": "allkeys-lru",
+            "io_threads": 1,
+            "persistence": "none",
+        }
+
+        key = redis.config_to_key(config, "selectel")
+        assert key == redis.config_to_key(dict(sorted(config.items())), "selectel")
+        assert key != redis.config_to_key({**config, "io_threads": 2}, "selectel")
+
+    @pytest.mark.parametrize("name", ["meilisearch", "postgres"])
+    def test_infra_and_config(self, name: str, request: pytest.FixtureRequest):
+        module = request.getfixturevalue(name)
+        infra = {"cpu": 4, "ram_gb": 8, "disk_type": "fast"}
+        config = {"a": 1, "b": 2}
+
+        key = module.config_to_key(infra, config, "selectel")
+        assert key == module.config_to_key(
+            dict(reversed(list(infra.items()))), {"b": 2, "a": 1}, "selectel"
+        )
+        assert key != module.config_to_key(infra, {}, "selectel")
+        # Infra and config values must not be interchangeable
+        assert module.config_to_key({}, infra, "selectel") != module.config_to_key(
+            infra, {}, "selectel"
+        )
@@ -0,0 +1,52 @@
+import { describe, it, expect, beforeAll, afterAll } from "vitest";
+import { execFileSync } from "child_process";
+import { mkdtempSync, readFileSync, rmSync } from "fs";
+import { tmpdir } from "os";
+import { join } from "path";
+import { gunzipSync } from "zlib";
+
+const DATASET_SCRIPT = join(import.meta.dirname, "../optuna/meilisearch-optimizer/dataset.ts");
+
+// Not a multiple of the worker counts below, so the last range is shorter
+const COUNT = 5003;
+
+describe("meilisearch dataset.ts", () => {
+  let dir: string;
+
+  const generate = (output: string, ...args: string[]): Buffer => {
+    const path = join(dir, output);
+    execFileSync("npx", [
+      "tsx",
+      DATASET_SCRIPT,
+      "--count",
+      String(COUNT),
+      "--output",
+      path,
+      ...args,
+    ]);
+    return readFileSync(path);
+  };
+
+  beforeAll(() => {
+    dir = mkdtempSync(join(tmpdir(), "dataset-test-"));
+  });
+
+  afterAll(() => {
+    rmSync(dir, { recursive: true, force: true });
+  });
+
+  it("produces the same documents for any worker count", () => {
+    const single = generate("w1.ndjson", "--workers", "1");
+
+    expect(single.toString().trimEnd().split("\n")).toHaveLength(COUNT);
+    expect(generate("w3.ndjson", "--workers", "3").equals(single)).toBe(true);
+    expect(gunzipSync(generate("w4.ndjson.gz", "--workers", "4")).equals(single)).toBe(true);
+  });
+
+  it("depends on the seed", () => {
+    const a = generate("seed1.ndjson", "--seed", "1", "--workers", "2");
+    const b = generate("seed2.ndjson", "--seed", "2", "--workers", "2");
+
+    expect(a.equals(b)).toBe(false);
+  });
+});